@@ -49,6 +49,8 @@ class ServerConfig:
     host: str = "0.0.0.0"
     port: int = 3003
     reload: bool = True
+    workers: int = 1
+    access_log: bool = False
     secret_key: str = "your-secret-key-here-change-this-in-production"
     cors_origins: list = None
 
@@ -149,6 +151,13 @@ class BK25Config:
             except ValueError:
                 print(f"[CONFIG] Warning: Invalid BK25_PORT value, using default: {self.server.port}")
         self.server.reload = os.getenv("BK25_RELOAD", "true").lower() == "true"
+        if os.getenv("BK25_WORKERS"):
+            try:
+                self.server.workers = int(os.getenv("BK25_WORKERS"))
+            except ValueError:
+                print(f"[CONFIG] Warning: Invalid BK25_WORKERS value, using default: {self.server.workers}")
+        if os.getenv("BK25_ACCESS_LOG"):
+            self.server.access_log = os.getenv("BK25_ACCESS_LOG").lower() == "true"
         self.server.secret_key = os.getenv("SECRET_KEY", self.server.secret_key)
         
         # CORS Origins
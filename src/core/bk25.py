@@ -10,6 +10,7 @@ Main application controller that orchestrates all BK25 components:
 """
 
 import asyncio
+import time
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
@@ -71,6 +72,11 @@ class BK25Core:
         # Connection status
         self.ollama_connected = False
         
+        # Task status polling: one lookup in flight per task, results reused for a short TTL
+        self.task_status_ttl = self.config.get('task_status_ttl', 0.1)
+        self._task_status_inflight: Dict[str, asyncio.Future] = {}
+        self._task_status_cache: Dict[str, tuple] = {}
+        
         self.logger = get_logger("bk25_core")
         self.logger.info("[INIT] BK25 Core initialized")
     
@@ -647,7 +653,39 @@ class BK25Core:
             }
     
     async def get_task_status(self, task_id: str) -> Dict[str, Any]:
-        """Get the status of an execution task"""
+        """Get the status of an execution task, coalescing concurrent polls"""
+        cached = self._task_status_cache.get(task_id)
+        if cached and time.monotonic() - cached[0] < self.task_status_ttl:
+            return cached[1]
+        
+        inflight = self._task_status_inflight.get(task_id)
+        if inflight:
+            return await asyncio.shield(inflight)
+        
+        lookup = asyncio.ensure_future(self._lookup_task_status(task_id))
+        self._task_status_inflight[task_id] = lookup
+        try:
+            result = await asyncio.shield(lookup)
+        finally:
+            superseded = self._task_status_inflight.get(task_id) is not lookup
+            if not superseded:
+                del self._task_status_inflight[task_id]
+        
+        # A cancel during the lookup discarded it; its status may predate the cancel
+        if superseded:
+            return result
+        
+        now = time.monotonic()
+        # Drop expired entries so the cache only holds recently polled tasks
+        self._task_status_cache = {
+            key: entry for key, entry in self._task_status_cache.items()
+            if now - entry[0] < self.task_status_ttl
+        }
+        self._task_status_cache[task_id] = (now, result)
+        return result
+    
+    async def _lookup_task_status(self, task_id: str) -> Dict[str, Any]:
+        """Look up and serialize the status of an execution task"""
         try:
             task = await self.execution_monitor.get_task_status(task_id)
             if not task:
@@ -658,22 +696,7 @@ class BK25Core:
             
             return {
                 'success': True,
-                'task': {
-                    'id': task.id,
-                    'name': task.name,
-                    'description': task.description,
-                    'status': task.status.value,
-                    'priority': task.priority.value,
-                    'created_at': task.created_at.isoformat() if task.created_at else None,
-                    'started_at': task.started_at.isoformat() if task.started_at else None,
-                    'completed_at': task.completed_at.isoformat() if task.completed_at else None,
-                    'execution_time': task.execution_time,
-                    'exit_code': task.exit_code,
-                    'output': task.output,
-                    'error': task.error,
-                    'tags': task.tags,
-                    'metadata': task.metadata
-                }
+                'task': self._serialize_task(task)
             }
             
         except Exception as error:
@@ -687,6 +710,9 @@ class BK25Core:
         """Cancel a running or queued execution task"""
         try:
             success = await self.execution_monitor.cancel_task(task_id)
+            # Drop the cached status and any lookup started before the cancel
+            self._task_status_cache.pop(task_id, None)
+            self._task_status_inflight.pop(task_id, None)
             
             return {
                 'success': success,
@@ -700,6 +726,25 @@ class BK25Core:
                 'error': f"Task cancellation error: {str(error)}"
             }
     
+    def _serialize_task(self, task) -> Dict[str, Any]:
+        """Convert an execution task into a JSON-serializable dict"""
+        return {
+            'id': task.id,
+            'name': task.name,
+            'description': task.description,
+            'status': task.status.value,
+            'priority': task.priority.value,
+            'created_at': task.created_at_iso,
+            'started_at': task.started_at_iso,
+            'completed_at': task.completed_at_iso,
+            'execution_time': task.execution_time,
+            'exit_code': task.exit_code,
+            'output': task.output,
+            'error': task.error,
+            'tags': task.tags,
+            'metadata': task.metadata
+        }
+    
     async def get_execution_history(
         self,
         limit: int = 100,
@@ -729,24 +774,7 @@ class BK25Core:
             )
             
             # Convert to serializable format
-            task_list = []
-            for task in tasks:
-                task_list.append({
-                    'id': task.id,
-                    'name': task.name,
-                    'description': task.description,
-                    'status': task.status.value,
-                    'priority': task.priority.value,
-                    'created_at': task.created_at.isoformat() if task.created_at else None,
-                    'started_at': task.started_at.isoformat() if task.started_at else None,
-                    'completed_at': task.completed_at.isoformat() if task.completed_at else None,
-                    'execution_time': task.execution_time,
-                    'exit_code': task.exit_code,
-                    'output': task.output,
-                    'error': task.error,
-                    'tags': task.tags,
-                    'metadata': task.metadata
-                })
+            task_list = [self._serialize_task(task) for task in tasks]
             
             return {
                 'success': True,
@@ -764,14 +792,14 @@ class BK25Core:
     async def get_system_statistics(self) -> Dict[str, Any]:
         """Get system execution statistics"""
         try:
-            # Get execution monitor statistics
-            exec_stats = await self.execution_monitor.get_system_statistics()
-            
-            # Get script executor system resources
-            system_resources = self.script_executor.get_system_resources()
-            
-            # Get LLM system status
-            llm_status = await self.get_llm_status()
+            # Collect execution statistics, system resources and LLM status
+            # concurrently; resource sampling blocks, so it runs in a thread
+            loop = asyncio.get_running_loop()
+            exec_stats, system_resources, llm_status = await asyncio.gather(
+                self.execution_monitor.get_system_statistics(),
+                loop.run_in_executor(None, self.script_executor.get_system_resources),
+                self.get_llm_status()
+            )
             
             return {
                 'success': True,
@@ -49,6 +49,15 @@ class ExecutionTask:
     tags: List[str] = field(default_factory=list)
     retry_count: int = 0
     max_retries: int = 3
+    # ISO-8601 copies of the timestamps, set once at each state transition
+    created_at_iso: Optional[str] = field(init=False, repr=False)
+    started_at_iso: Optional[str] = field(init=False, repr=False)
+    completed_at_iso: Optional[str] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.created_at_iso = self.created_at.isoformat() if self.created_at else None
+        self.started_at_iso = self.started_at.isoformat() if self.started_at else None
+        self.completed_at_iso = self.completed_at.isoformat() if self.completed_at else None
 
 @dataclass
 class TaskMetrics:
@@ -199,6 +208,7 @@ class ExecutionMonitor:
             # Update task status
             task.status = TaskStatus.CANCELLED
             task.completed_at = datetime.now()
+            task.completed_at_iso = task.completed_at.isoformat()
             
             self.logger.info(f"🚫 Task cancelled: {task.name} (ID: {task_id})")
             
@@ -374,6 +384,7 @@ class ExecutionMonitor:
             # Update status
             task.status = TaskStatus.RUNNING
             task.started_at = datetime.now()
+            task.started_at_iso = task.started_at.isoformat()
             await self._notify_status_change(task)
             
             # Create execution task
@@ -393,6 +404,7 @@ class ExecutionMonitor:
             task.status = TaskStatus.FAILED
             task.error = str(error)
             task.completed_at = datetime.now()
+            task.completed_at_iso = task.completed_at.isoformat()
             
             # Update statistics
             self.stats['failed_tasks'] += 1
@@ -415,6 +427,7 @@ class ExecutionMonitor:
             # Simulate success
             task.status = TaskStatus.COMPLETED
             task.completed_at = datetime.now()
+            task.completed_at_iso = task.completed_at.isoformat()
             task.execution_time = (task.completed_at - task.started_at).total_seconds()
             task.exit_code = 0
             task.output = "Task completed successfully"
@@ -433,6 +446,7 @@ class ExecutionMonitor:
             task.status = TaskStatus.FAILED
             task.error = str(error)
             task.completed_at = datetime.now()
+            task.completed_at_iso = task.completed_at.isoformat()
             
             # Update statistics
             self.stats['failed_tasks'] += 1
@@ -299,9 +299,12 @@ class LLMManager:
                     self.logger.info(f"Using preferred provider: {preferred_provider}")
                     return await provider.generate(request)
             
-            # Find the best available provider
+            # Find the best available provider, skipping the preferred one
+            # since it was already probed above
             available_providers = []
             for name, provider in self.providers.items():
+                if name == preferred_provider:
+                    continue
                 if await provider.is_available():
                     available_providers.append((name, provider))
             
@@ -329,15 +332,20 @@ class LLMManager:
         return list(self.providers.keys())
     
     async def test_providers(self) -> Dict[str, bool]:
-        """Test all providers and return availability status"""
-        results = {}
+        """Test all providers concurrently and return availability status"""
+        names = list(self.providers)
+        outcomes = await asyncio.gather(
+            *(self.providers[name].is_available() for name in names),
+            return_exceptions=True
+        )
         
-        for name, provider in self.providers.items():
-            try:
-                results[name] = await provider.is_available()
-            except Exception as error:
-                self.logger.error(f"Error testing provider {name}: {error}")
+        results = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, BaseException):
+                self.logger.error(f"Error testing provider {name}: {outcome}")
                 results[name] = False
+            else:
+                results[name] = outcome
         
         return results
     
@@ -93,6 +93,11 @@ class ConversationMemory:
         """Get a conversation by ID"""
         return self.conversations.get(conversation_id)
     
+    def get_conversations(self, conversation_ids: List[str]) -> Dict[str, Optional[Conversation]]:
+        """Get several conversations by ID in one call"""
+        conversations = self.conversations
+        return {conv_id: conversations.get(conv_id) for conv_id in conversation_ids}
+    
     def get_conversation_history(self, conversation_id: str, limit: Optional[int] = None) -> List[ConversationMessage]:
         """Get conversation history, optionally limited to recent messages"""
         conversation = self.get_conversation(conversation_id)
@@ -9,14 +9,20 @@ From Peter Swimm (original Botkit PM) and the Toilville team
 """
 
 import os
+import hashlib
 import uvicorn
 import time
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
 from pathlib import Path
 from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, ConfigDict
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # Import BK25 core components
 from src.core.bk25 import BK25Core
@@ -33,6 +39,101 @@ from src.config import config
 # Global BK25 instance
 bk25: Optional[BK25Core] = None
 
+# Request models for POST endpoints. Required fields stay optional here so
+# the endpoints keep returning their own 400 messages for missing values, and
+# defaults are applied in the handlers so an explicit null still gets them.
+class CreatePersonaRequest(BaseModel):
+    """Body for POST /api/personas/create"""
+    model_config = ConfigDict(extra='ignore')
+    
+    id: Optional[str] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    personality: Optional[Dict[str, Any]] = None
+    capabilities: Any = None
+    examples: Optional[List[Any]] = None
+    channels: Optional[List[str]] = None
+    greeting: Optional[str] = None
+
+class ChatRequest(BaseModel):
+    """Body for POST /api/chat"""
+    model_config = ConfigDict(extra='ignore')
+    
+    message: Optional[str] = None
+    conversation_id: Optional[str] = None
+    persona_id: Optional[str] = None
+    channel_id: Optional[str] = None
+
+class GenerateRequest(BaseModel):
+    """Body for POST /api/generate"""
+    model_config = ConfigDict(extra='ignore')
+    
+    prompt: Optional[str] = None
+    conversation_id: Optional[str] = None
+    persona_id: Optional[str] = None
+
+class SuggestionsRequest(BaseModel):
+    """Body for POST /api/generate/suggestions"""
+    model_config = ConfigDict(extra='ignore')
+    
+    description: Optional[str] = None
+
+class LLMTestRequest(BaseModel):
+    """Body for POST /api/llm/test"""
+    model_config = ConfigDict(extra='ignore')
+    
+    prompt: Optional[str] = None
+    provider: Optional[str] = None
+
+class GenerateScriptRequest(BaseModel):
+    """Body for POST /api/generate/script"""
+    model_config = ConfigDict(extra='ignore')
+    
+    description: Optional[str] = None
+    platform: Optional[str] = None
+    options: Optional[Dict[str, Any]] = None
+
+class ImproveScriptRequest(BaseModel):
+    """Body for POST /api/scripts/improve"""
+    model_config = ConfigDict(extra='ignore')
+    
+    script: Optional[str] = None
+    feedback: Optional[str] = None
+    platform: Optional[str] = None
+    options: Optional[Dict[str, Any]] = None
+
+class ValidateScriptRequest(BaseModel):
+    """Body for POST /api/scripts/validate"""
+    model_config = ConfigDict(extra='ignore')
+    
+    script: Optional[str] = None
+    platform: Optional[str] = None
+    options: Optional[Dict[str, Any]] = None
+
+class ExecuteScriptRequest(BaseModel):
+    """Body for POST /api/execute/script"""
+    model_config = ConfigDict(extra='ignore')
+    
+    script: Optional[str] = None
+    platform: Optional[str] = None
+    filename: Optional[str] = None
+    working_directory: Optional[str] = None
+    timeout: Optional[int] = None
+    policy: Optional[str] = None
+    environment: Optional[Dict[str, str]] = None
+
+class SubmitTaskRequest(BaseModel):
+    """Body for POST /api/execute/task"""
+    model_config = ConfigDict(extra='ignore')
+    
+    name: Optional[str] = None
+    description: Optional[str] = None
+    script: Optional[str] = None
+    platform: Optional[str] = None
+    priority: Optional[str] = None
+    tags: Optional[List[str]] = None
+    metadata: Optional[Dict[str, Any]] = None
+
 # Modern lifespan event handler (replaces deprecated on_event)
 from contextlib import asynccontextmanager
 
@@ -108,6 +209,21 @@ async def lifespan(app: FastAPI):
     except Exception as error:
         print(f"[ERROR] Error during shutdown: {error}")
 
+# Paths under /api/ that work without an initialized BK25 core
+BK25_OPTIONAL_PATHS = ("/api/settings",)
+
+async def attach_bk25(request: Request):
+    """Expose the BK25 core on request.state and reject API calls until it is ready
+    
+    Runs as an app-wide dependency, so only matched routes are checked and the
+    503 is raised inside the CORS layer like any other HTTPException.
+    """
+    path = request.url.path
+    if bk25 is None and path.startswith("/api/") and not path.startswith(BK25_OPTIONAL_PATHS):
+        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    
+    request.state.bk25 = bk25
+
 # Update FastAPI app to use lifespan
 app = FastAPI(
     title="BK25 - Multi-Persona Channel Simulator",
@@ -115,9 +231,46 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    dependencies=[Depends(attach_bk25)]
 )
 
+class UnhandledErrorMiddleware:
+    """Turn any uncaught endpoint error into a JSON 500 response
+    
+    Added before CORS so it runs inside it and error responses keep their CORS
+    headers; an app-level Exception handler would run outside CORS. Plain ASGI
+    rather than @app.middleware so responses are passed through unbuffered.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Too late to replace a response that is already on the wire
+            if response_started:
+                raise
+            print(f"[ERROR] {scope['method']} {scope['path']} failed: {exc}")
+            response = JSONResponse(status_code=500, content={"detail": f"Internal error: {exc}"})
+            await response(scope, receive, send)
+
+app.add_middleware(UnhandledErrorMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -127,6 +280,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress only large responses (execution history, long listings); small
+# status payloads are not worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=4096, compresslevel=4)
+
+@app.exception_handler(StarletteHTTPException)
+async def not_found_handler(request: Request, exc: StarletteHTTPException):
+    """Answer requests that matched no route with a debugging hint"""
+    # Only unrouted requests; 404s raised by endpoints keep their own detail,
+    # and wrong-method calls on real routes keep their 405 and Allow header.
+    if exc.status_code != 404 or "endpoint" in request.scope:
+        return await http_exception_handler(request, exc)
+    
+    path = request.url.path
+    if path.startswith("/api/"):
+        return JSONResponse(status_code=404, content={"detail": "API endpoint not found"})
+    
+    return JSONResponse(status_code=404, content={
+        "message": f"Route not found: {path}",
+        "available_routes": [
+            "/",
+            "/web/",
+            "/app",
+            "/info",
+            "/debug",
+            "/health",
+            "/docs"
+        ]
+    })
+
+def etag_response(request: Request, content: Any) -> Response:
+    """Return content as JSON with an ETag, or an empty 304 if the client already has it"""
+    response = JSONResponse(jsonable_encoder(content))
+    etag = f'"{hashlib.blake2b(response.body, digest_size=16).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    return response
+
 # Mount static files (web interface)
 web_path = Path(__file__).parent.parent / "web"
 print(f"[DEBUG] Web path: {web_path}")
@@ -167,138 +359,124 @@ if web_path.exists():
 @app.get("/api/settings")
 async def get_settings():
     """Get current LLM settings"""
-    try:
-        # Get settings from the configuration system
-        return config.get_llm_settings()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting settings: {str(e)}")
+    # Get settings from the configuration system
+    return config.get_llm_settings()
 
 @app.post("/api/settings")
 async def save_settings(settings: dict):
     """Save LLM settings"""
-    try:
-        # Validate required fields based on provider
-        provider = settings.get("provider")
-        if not provider:
-            raise HTTPException(status_code=400, detail="Provider is required")
-        
-        if provider == "ollama":
-            if not settings.get("ollama", {}).get("url"):
-                raise HTTPException(status_code=400, detail="Ollama URL is required")
-            if not settings.get("ollama", {}).get("model"):
-                raise HTTPException(status_code=400, detail="Ollama model is required")
-        elif provider in ["openai", "anthropic", "google"]:
-            provider_names = {"openai": "OpenAI", "anthropic": "Anthropic", "google": "Google"}
-            provider_name = provider_names.get(provider, provider.title())
-            if not settings.get(provider, {}).get("apiKey"):
-                raise HTTPException(status_code=400, detail=f"{provider_name} API key is required")
-            if not settings.get(provider, {}).get("model"):
-                raise HTTPException(status_code=400, detail=f"{provider_name} model is required")
-        elif provider == "custom":
-            if not settings.get("custom", {}).get("url"):
-                raise HTTPException(status_code=400, detail="Custom API URL is required")
-            if not settings.get("custom", {}).get("apiKey"):
-                raise HTTPException(status_code=400, detail="Custom API key is required")
-        
-        # Save settings to the configuration system
-        config.update_llm_settings(settings)
-        print(f"[INFO] Settings updated: {provider} provider configured")
-        
-        return {"message": "Settings saved successfully", "provider": provider}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error saving settings: {str(e)}")
+    # Validate required fields based on provider
+    provider = settings.get("provider")
+    if not provider:
+        raise HTTPException(status_code=400, detail="Provider is required")
+    
+    if provider == "ollama":
+        if not settings.get("ollama", {}).get("url"):
+            raise HTTPException(status_code=400, detail="Ollama URL is required")
+        if not settings.get("ollama", {}).get("model"):
+            raise HTTPException(status_code=400, detail="Ollama model is required")
+    elif provider in ["openai", "anthropic", "google"]:
+        provider_names = {"openai": "OpenAI", "anthropic": "Anthropic", "google": "Google"}
+        provider_name = provider_names.get(provider, provider.title())
+        if not settings.get(provider, {}).get("apiKey"):
+            raise HTTPException(status_code=400, detail=f"{provider_name} API key is required")
+        if not settings.get(provider, {}).get("model"):
+            raise HTTPException(status_code=400, detail=f"{provider_name} model is required")
+    elif provider == "custom":
+        if not settings.get("custom", {}).get("url"):
+            raise HTTPException(status_code=400, detail="Custom API URL is required")
+        if not settings.get("custom", {}).get("apiKey"):
+            raise HTTPException(status_code=400, detail="Custom API key is required")
+    
+    # Save settings to the configuration system
+    config.update_llm_settings(settings)
+    print(f"[INFO] Settings updated: {provider} provider configured")
+    
+    return {"message": "Settings saved successfully", "provider": provider}
 
 @app.post("/api/settings/test")
 async def test_connection(settings: dict):
     """Test LLM connection with current settings"""
-    try:
-        provider = settings.get("provider")
-        if not provider:
-            raise HTTPException(status_code=400, detail="Provider is required")
-        
-        start_time = time.time()
+    provider = settings.get("provider")
+    if not provider:
+        raise HTTPException(status_code=400, detail="Provider is required")
+    
+    start_time = time.time()
+    
+    if provider == "ollama":
+        # Test Ollama connection
+        ollama_settings = settings.get("ollama", {})
+        url = ollama_settings.get("url", "http://localhost:11434")
+        model = ollama_settings.get("model", "llama3.1:8b")
         
-        if provider == "ollama":
-            # Test Ollama connection
-            ollama_settings = settings.get("ollama", {})
-            url = ollama_settings.get("url", "http://localhost:11434")
-            model = ollama_settings.get("model", "llama3.1:8b")
-            
-            import httpx
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.get(f"{url}/api/tags", timeout=10)
-                    if response.status_code == 200:
-                        models = response.json()
-                        # Check if the specified model is available
-                        available_models = [model['name'] for model in models.get('models', [])]
-                        if model in available_models:
-                            response_time = int((time.time() - start_time) * 1000)
-                            return {
-                                "success": True,
-                                "model": model,
-                                "responseTime": response_time,
-                                "availableModels": available_models,
-                                "message": f"Successfully connected to Ollama at {url}"
-                            }
-                        else:
-                            return {
-                                "success": False,
-                                "error": f"Model '{model}' not found. Available models: {', '.join(available_models)}",
-                                "message": f"Model '{model}' not found in available models"
-                            }
+        import httpx
+        async with httpx.AsyncClient() as client:
+            try:
+                response = await client.get(f"{url}/api/tags", timeout=10)
+                if response.status_code == 200:
+                    models = response.json()
+                    # Check if the specified model is available
+                    available_models = [model['name'] for model in models.get('models', [])]
+                    if model in available_models:
+                        response_time = int((time.time() - start_time) * 1000)
+                        return {
+                            "success": True,
+                            "model": model,
+                            "responseTime": response_time,
+                            "availableModels": available_models,
+                            "message": f"Successfully connected to Ollama at {url}"
+                        }
                     else:
-                        return {"success": False, "error": f"Ollama server returned status {response.status_code}", "message": "Ollama server error"}
-                except httpx.ConnectError:
-                    return {"success": False, "error": "Cannot connect to Ollama server. Is it running?", "message": "Connection failed"}
-                except httpx.TimeoutException:
-                    return {"success": False, "error": "Connection timeout. Check if Ollama is running and accessible.", "message": "Connection timeout"}
-                except Exception as e:
-                    return {"success": False, "error": f"Connection error: {str(e)}", "message": "Unexpected error"}
+                        return {
+                            "success": False,
+                            "error": f"Model '{model}' not found. Available models: {', '.join(available_models)}",
+                            "message": f"Model '{model}' not found in available models"
+                        }
+                else:
+                    return {"success": False, "error": f"Ollama server returned status {response.status_code}", "message": "Ollama server error"}
+            except httpx.ConnectError:
+                return {"success": False, "error": "Cannot connect to Ollama server. Is it running?", "message": "Connection failed"}
+            except httpx.TimeoutException:
+                return {"success": False, "error": "Connection timeout. Check if Ollama is running and accessible.", "message": "Connection timeout"}
+            except Exception as e:
+                return {"success": False, "error": f"Connection error: {str(e)}", "message": "Unexpected error"}
+    
+    elif provider in ["openai", "anthropic", "google"]:
+        # For now, just validate the API key format
+        provider_settings = settings.get(provider, {})
+        api_key = provider_settings.get("apiKey", "")
+        provider_names = {"openai": "OpenAI", "anthropic": "Anthropic", "google": "Google"}
+        provider_name = provider_names.get(provider, provider.title())
         
-        elif provider in ["openai", "anthropic", "google"]:
-            # For now, just validate the API key format
-            provider_settings = settings.get(provider, {})
-            api_key = provider_settings.get("apiKey", "")
-            provider_names = {"openai": "OpenAI", "anthropic": "Anthropic", "google": "Google"}
-            provider_name = provider_names.get(provider, provider.title())
-            
-            if not api_key or len(api_key) < 10:
-                return {"success": False, "error": f"Invalid {provider_name} API key format", "message": f"API key validation failed for {provider_name}"}
-            
-            # In a real implementation, you'd make a test API call
-            response_time = int((time.time() - start_time) * 1000)
-            return {
-                "success": True,
-                "model": provider_settings.get("model", "unknown"),
-                "responseTime": response_time,
-                "message": f"{provider_name} API key format validated. Test API call not implemented yet."
-            }
+        if not api_key or len(api_key) < 10:
+            return {"success": False, "error": f"Invalid {provider_name} API key format", "message": f"API key validation failed for {provider_name}"}
         
-        elif provider == "custom":
-            # Validate custom API URL format
-            custom_settings = settings.get("custom", {})
-            url = custom_settings.get("url", "")
-            if not url or not url.startswith(("http://", "https://")):
-                return {"success": False, "error": "Invalid custom API URL format", "message": "URL validation failed"}
-            
-            response_time = int((time.time() - start_time) * 1000)
-            return {
-                "success": True,
-                "model": custom_settings.get("model", "custom"),
-                "responseTime": response_time,
-                "message": "Custom API URL format validated. Test API call not implemented yet."
-            }
+        # In a real implementation, you'd make a test API call
+        response_time = int((time.time() - start_time) * 1000)
+        return {
+            "success": True,
+            "model": provider_settings.get("model", "unknown"),
+            "responseTime": response_time,
+            "message": f"{provider_name} API key format validated. Test API call not implemented yet."
+        }
+    
+    elif provider == "custom":
+        # Validate custom API URL format
+        custom_settings = settings.get("custom", {})
+        url = custom_settings.get("url", "")
+        if not url or not url.startswith(("http://", "https://")):
+            return {"success": False, "error": "Invalid custom API URL format", "message": "URL validation failed"}
         
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported provider: {provider}")
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error testing connection: {str(e)}")
+        response_time = int((time.time() - start_time) * 1000)
+        return {
+            "success": True,
+            "model": custom_settings.get("model", "custom"),
+            "responseTime": response_time,
+            "message": "Custom API URL format validated. Test API call not implemented yet."
+        }
+    
+    else:
+        raise HTTPException(status_code=400, detail=f"Unsupported provider: {provider}")
 
 # Debug route to test routing
 @app.get("/debug")
@@ -312,8 +490,9 @@ async def debug():
     }
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
+    bk25 = request.state.bk25
     if not bk25:
         raise HTTPException(status_code=503, detail="BK25 not initialized")
     
@@ -334,75 +513,62 @@ async def health_check():
         }
 
 @app.get("/api/personas")
-async def get_personas(channel: str = "web"):
+async def get_personas(request: Request, channel: str = "web"):
     """Get available personas for a channel"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        personas = bk25.persona_manager.get_personas_for_channel(channel)
-        return {
-            "personas": [
-                {
-                    "id": persona.id,
-                    "name": persona.name,
-                    "description": persona.description,
-                    "greeting": persona.greeting,
-                    "capabilities": persona.capabilities,
-                    "personality": {
-                        "tone": persona.personality.tone,
-                        "approach": persona.personality.approach,
-                        "philosophy": persona.personality.philosophy,
-                        "motto": persona.personality.motto
-                    },
-                    "examples": persona.examples,
-                    "channels": persona.channels
-                }
-                for persona in personas
-            ],
-            "current_persona": bk25.persona_manager.get_current_persona().id if bk25.persona_manager.get_current_persona() else None,
-            "total_count": len(personas)
-        }
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error loading personas: {str(error)}")
+    personas = bk25.persona_manager.get_personas_for_channel(channel)
+    return {
+        "personas": [
+            {
+                "id": persona.id,
+                "name": persona.name,
+                "description": persona.description,
+                "greeting": persona.greeting,
+                "capabilities": persona.capabilities,
+                "personality": {
+                    "tone": persona.personality.tone,
+                    "approach": persona.personality.approach,
+                    "philosophy": persona.personality.philosophy,
+                    "motto": persona.personality.motto
+                },
+                "examples": persona.examples,
+                "channels": persona.channels
+            }
+            for persona in personas
+        ],
+        "current_persona": bk25.persona_manager.get_current_persona().id if bk25.persona_manager.get_current_persona() else None,
+        "total_count": len(personas)
+    }
 
 @app.get("/api/personas/current")
-async def get_current_persona():
+async def get_current_persona(request: Request):
     """Get current active persona"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        current_persona = bk25.persona_manager.get_current_persona()
-        if not current_persona:
-            raise HTTPException(status_code=404, detail="No current persona set")
-        
-        return {
-            "id": current_persona.id,
-            "name": current_persona.name,
-            "description": current_persona.description,
-            "personality": {
-                "tone": current_persona.personality.tone,
-                "approach": current_persona.personality.approach,
-                "philosophy": current_persona.personality.philosophy,
-                "motto": current_persona.personality.motto
-            },
-            "capabilities": current_persona.capabilities,
-            "examples": current_persona.examples,
-            "channels": current_persona.channels
-        }
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting current persona: {str(error)}")
+    current_persona = bk25.persona_manager.get_current_persona()
+    if not current_persona:
+        raise HTTPException(status_code=404, detail="No current persona set")
+    
+    return {
+        "id": current_persona.id,
+        "name": current_persona.name,
+        "description": current_persona.description,
+        "personality": {
+            "tone": current_persona.personality.tone,
+            "approach": current_persona.personality.approach,
+            "philosophy": current_persona.personality.philosophy,
+            "motto": current_persona.personality.motto
+        },
+        "capabilities": current_persona.capabilities,
+        "examples": current_persona.examples,
+        "channels": current_persona.channels
+    }
 
 @app.get("/api/personas/{persona_id}")
-async def get_persona(persona_id: str):
+async def get_persona(request: Request, persona_id: str):
     """Get specific persona by ID"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
     persona = bk25.persona_manager.get_persona(persona_id)
     if not persona:
@@ -425,10 +591,9 @@ async def get_persona(persona_id: str):
     }
 
 @app.post("/api/personas/{persona_id}/switch")
-async def switch_persona(persona_id: str):
+async def switch_persona(request: Request, persona_id: str):
     """Switch to a different persona"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
     persona = bk25.switch_persona(persona_id)
     if not persona:
@@ -440,128 +605,107 @@ async def switch_persona(persona_id: str):
     }
 
 @app.post("/api/personas/create")
-async def create_persona(request: Request):
+def create_persona(request: Request, body: CreatePersonaRequest):
     """Create a new custom persona"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        body = await request.json()
-        
-        # Validate required fields
-        required_fields = ["name", "description", "personality"]
-        for field in required_fields:
-            if field not in body:
-                raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
-        
-        # Create persona data structure
-        persona_data = {
-            "id": body.get("id", f"custom-{body['name'].lower().replace(' ', '-')}"),
-            "name": body["name"],
-            "description": body["description"],
-            "personality": body["personality"],
-            "capabilities": body.get("capabilities", {}),
-            "examples": body.get("examples", []),
-            "channels": body.get("channels", ["web"]),
-            "greeting": body.get("greeting", f"Hello! I'm {body['name']}. How can I help you today?")
-        }
-        
-        # Add to persona manager
-        new_persona = bk25.persona_manager.add_custom_persona(persona_data)
-        if not new_persona:
-            raise HTTPException(status_code=500, detail="Failed to create persona")
-        
-        return {
-            "message": f"Persona {persona_data['name']} created successfully",
-            "persona": {
-                "id": new_persona.id,
-                "name": new_persona.name,
-                "description": new_persona.description,
-                "personality": {
-                    "tone": new_persona.personality.tone,
-                    "approach": new_persona.personality.approach,
-                    "philosophy": new_persona.personality.philosophy,
-                    "motto": new_persona.personality.motto
-                },
-                "capabilities": new_persona.capabilities,
-                "examples": new_persona.examples,
-                "channels": new_persona.channels
-            }
+    # Validate required fields
+    required_fields = ["name", "description", "personality"]
+    for field in required_fields:
+        if getattr(body, field) is None:
+            raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
+    
+    # Create persona data structure
+    persona_data = {
+        "id": body.id or f"custom-{body.name.lower().replace(' ', '-')}",
+        "name": body.name,
+        "description": body.description,
+        "personality": body.personality,
+        "capabilities": body.capabilities or {},
+        "examples": body.examples or [],
+        "channels": body.channels or ["web"],
+        "greeting": body.greeting or f"Hello! I'm {body.name}. How can I help you today?"
+    }
+    
+    # Add to persona manager
+    new_persona = bk25.persona_manager.add_custom_persona(persona_data)
+    if not new_persona:
+        raise HTTPException(status_code=500, detail="Failed to create persona")
+    
+    return {
+        "message": f"Persona {persona_data['name']} created successfully",
+        "persona": {
+            "id": new_persona.id,
+            "name": new_persona.name,
+            "description": new_persona.description,
+            "personality": {
+                "tone": new_persona.personality.tone,
+                "approach": new_persona.personality.approach,
+                "philosophy": new_persona.personality.philosophy,
+                "motto": new_persona.personality.motto
+            },
+            "capabilities": new_persona.capabilities,
+            "examples": new_persona.examples,
+            "channels": new_persona.channels
         }
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error creating persona: {str(error)}")
+    }
 
 @app.get("/api/channels")
-async def get_channels():
+async def get_channels(request: Request):
     """Get available channels"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        channels = bk25.channel_manager.get_all_channels()
-        return {
-            "channels": [
-                {
-                    "id": channel.id,
-                    "name": channel.name,
-                    "description": channel.description,
-                    "capabilities": {
-                        name: {
-                            "supported": cap.supported if hasattr(cap, 'supported') else cap.get('supported', False),
-                            "description": cap.description if hasattr(cap, 'description') else cap.get('description', '')
-                        }
-                        for name, cap in channel.capabilities.items()
-                    },
-                    "artifact_types": channel.artifact_types,
-                    "metadata": channel.metadata
-                }
-                for channel in channels
-            ],
-            "current_channel": bk25.channel_manager.current_channel,
-            "total_count": len(channels)
-        }
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error loading channels: {str(error)}")
+    channels = bk25.channel_manager.get_all_channels()
+    return {
+        "channels": [
+            {
+                "id": channel.id,
+                "name": channel.name,
+                "description": channel.description,
+                "capabilities": {
+                    name: {
+                        "supported": cap.supported if hasattr(cap, 'supported') else cap.get('supported', False),
+                        "description": cap.description if hasattr(cap, 'description') else cap.get('description', '')
+                    }
+                    for name, cap in channel.capabilities.items()
+                },
+                "artifact_types": channel.artifact_types,
+                "metadata": channel.metadata
+            }
+            for channel in channels
+        ],
+        "current_channel": bk25.channel_manager.current_channel,
+        "total_count": len(channels)
+    }
 
 @app.get("/api/channels/current")
-async def get_current_channel():
+async def get_current_channel(request: Request):
     """Get current active channel"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        current_channel = bk25.channel_manager.get_current_channel()
-        if not current_channel:
-            raise HTTPException(status_code=404, detail="No current channel set")
-        
-        return {
-            "id": current_channel.id,
-            "name": current_channel.name,
-            "description": current_channel.description,
-            "capabilities": {
-                name: {
-                    "supported": cap.supported,
-                    "description": cap.description
-                }
-                for name, cap in current_channel.capabilities.items()
-            },
-            "artifact_types": current_channel.artifact_types,
-            "metadata": current_channel.metadata
-        }
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting current channel: {str(error)}")
+    current_channel = bk25.channel_manager.get_current_channel()
+    if not current_channel:
+        raise HTTPException(status_code=404, detail="No current channel set")
+    
+    return {
+        "id": current_channel.id,
+        "name": current_channel.name,
+        "description": current_channel.description,
+        "capabilities": {
+            name: {
+                "supported": cap.supported,
+                "description": cap.description
+            }
+            for name, cap in current_channel.capabilities.items()
+        },
+        "artifact_types": current_channel.artifact_types,
+        "metadata": current_channel.metadata
+    }
 
 @app.get("/api/channels/{channel_id}")
-async def get_channel(channel_id: str):
+async def get_channel(request: Request, channel_id: str):
     """Get specific channel by ID"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
     channel = bk25.channel_manager.get_channel(channel_id)
     if not channel:
@@ -583,10 +727,9 @@ async def get_channel(channel_id: str):
     }
 
 @app.post("/api/channels/{channel_id}/switch")
-async def switch_channel(channel_id: str):
+async def switch_channel(request: Request, channel_id: str):
     """Switch to a different channel"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
     channel = bk25.switch_channel(channel_id)
     if not channel:
@@ -598,553 +741,354 @@ async def switch_channel(channel_id: str):
     }
 
 @app.post("/api/chat")
-async def chat_endpoint(request: Request):
+async def chat_endpoint(request: Request, body: ChatRequest):
     """Chat processing endpoint with code extraction"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        body = await request.json()
-        message = body.get("message", "")
-        conversation_id = body.get("conversation_id", "default")
-        persona_id = body.get("persona_id")
-        channel_id = body.get("channel_id")
-        
-        if not message:
-            raise HTTPException(status_code=400, detail="Message is required")
-        
-        # Process the message
-        result = await bk25.process_message(message, conversation_id, persona_id, channel_id)
-        
-        if "error" in result:
-            raise HTTPException(status_code=500, detail=result["error"])
-        
-        # Extract code blocks from the response if present
-        response_text = result.get("response", "")
-        extracted_code = None
+    message = body.message
+    conversation_id = body.conversation_id or "default"
+    persona_id = body.persona_id
+    channel_id = body.channel_id
+    
+    if not message:
+        raise HTTPException(status_code=400, detail="Message is required")
+    
+    # Process the message
+    result = await bk25.process_message(message, conversation_id, persona_id, channel_id)
+    
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    
+    # Extract code blocks from the response if present
+    response_text = result.get("response", "")
+    extracted_code = None
+    
+    if response_text and "```" in response_text:
+        # SIMPLE STRING REPLACEMENT - find the code block and replace it
+        start = response_text.find("```")
+        end = response_text.find("```", start + 3)
         
-        if response_text and "```" in response_text:
-            # SIMPLE STRING REPLACEMENT - find the code block and replace it
-            start = response_text.find("```")
-            end = response_text.find("```", start + 3)
+        if start != -1 and end != -1:
+            # Extract the code content
+            code_section = response_text[start:end + 3]
             
-            if start != -1 and end != -1:
-                # Extract the code content
-                code_section = response_text[start:end + 3]
-                
-                # Get language from first line after ```
-                lines = code_section.split('\n')
-                language = "script"
-                if len(lines) > 1:
-                    first_line = lines[1].strip()
-                    if first_line and first_line.isalpha():
-                        language = first_line
-                
-                # Extract just the code (remove the ``` markers and language line)
-                code_content = code_section[3:]  # Remove first ```
-                if code_content.startswith('\n'):
-                    code_content = code_content[1:]
-                if '\n' in code_content:
-                    code_content = code_content.split('\n', 1)[1]  # Skip language line
-                code_content = code_content[:-3]  # Remove last ```
-                
-                extracted_code = {
-                    "language": language,
-                    "code": code_content.strip(),
-                    "filename": f"Generated {language.capitalize()} Script"
-                }
-                
-                # REPLACE THE CODE BLOCK WITH THE WIDGET
-                widget = f'<div class="mt-2 p-2 bg-info bg-opacity-10 rounded border border-info"><div class="d-flex align-items-center text-info"><i class="bi bi-code-slash me-2"></i><span class="small">→ <strong>{language.upper()}</strong> script generated! Check the output panel to the right.</span></div></div>'
-                
-                response_text = response_text[:start] + widget + response_text[end + 3:]
-                
-                print(f"[DEBUG] Replaced code block with widget: {language}")
-        
-        # Return the modified response
-        enhanced_result = {
-            **result,
-            "response": response_text,  # This now has the widget instead of code
-            "extracted_code": extracted_code
-        }
-        
-        print(f"[DEBUG] Chat response: has_code={extracted_code is not None}")
-        if extracted_code:
-            print(f"[DEBUG] Code block: {extracted_code['language']} ({len(extracted_code['code'])} chars)")
-        
-        return enhanced_result
-        
-    except HTTPException:
-        raise
-    except Exception as error:
-        print(f"[ERROR] Chat endpoint error: {error}")
-        raise HTTPException(status_code=500, detail=f"Error processing chat: {str(error)}")
+            # Get language from first line after ```
+            lines = code_section.split('\n')
+            language = "script"
+            if len(lines) > 1:
+                first_line = lines[1].strip()
+                if first_line and first_line.isalpha():
+                    language = first_line
+            
+            # Extract just the code (remove the ``` markers and language line)
+            code_content = code_section[3:]  # Remove first ```
+            if code_content.startswith('\n'):
+                code_content = code_content[1:]
+            if '\n' in code_content:
+                code_content = code_content.split('\n', 1)[1]  # Skip language line
+            code_content = code_content[:-3]  # Remove last ```
+            
+            extracted_code = {
+                "language": language,
+                "code": code_content.strip(),
+                "filename": f"Generated {language.capitalize()} Script"
+            }
+            
+            # REPLACE THE CODE BLOCK WITH THE WIDGET
+            widget = f'<div class="mt-2 p-2 bg-info bg-opacity-10 rounded border border-info"><div class="d-flex align-items-center text-info"><i class="bi bi-code-slash me-2"></i><span class="small">→ <strong>{language.upper()}</strong> script generated! Check the output panel to the right.</span></div></div>'
+            
+            response_text = response_text[:start] + widget + response_text[end + 3:]
+            
+            print(f"[DEBUG] Replaced code block with widget: {language}")
+    
+    # Return the modified response
+    enhanced_result = {
+        **result,
+        "response": response_text,  # This now has the widget instead of code
+        "extracted_code": extracted_code
+    }
+    
+    print(f"[DEBUG] Chat response: has_code={extracted_code is not None}")
+    if extracted_code:
+        print(f"[DEBUG] Code block: {extracted_code['language']} ({len(extracted_code['code'])} chars)")
+    
+    return enhanced_result
 
 @app.post("/api/generate")
-async def generate_automation(request: Request):
+async def generate_automation(request: Request, body: GenerateRequest):
     """Automation generation endpoint"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        body = await request.json()
-        prompt = body.get("prompt", "")
-        conversation_id = body.get("conversation_id", "default")
-        persona_id = body.get("persona_id")
-        
-        if not prompt:
-            raise HTTPException(status_code=400, detail="Prompt is required")
-        
-        # Generate automation using the specified persona
-        if persona_id:
-            bk25.switch_persona(persona_id)
-        
-        # Generate completion
-        response = await bk25.generate_completion(prompt, conversation_id)
-        
-        return {
-            "generated_code": response,
-            "persona": bk25.persona_manager.get_current_persona().id if bk25.persona_manager.get_current_persona() else None,
-            "conversation_id": conversation_id
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error generating automation: {str(error)}")
+    prompt = body.prompt
+    conversation_id = body.conversation_id or "default"
+    persona_id = body.persona_id
+    
+    if not prompt:
+        raise HTTPException(status_code=400, detail="Prompt is required")
+    
+    # Generate automation using the specified persona
+    if persona_id:
+        bk25.switch_persona(persona_id)
+    
+    # Generate completion
+    response = await bk25.generate_completion(prompt, conversation_id)
+    
+    return {
+        "generated_code": response,
+        "persona": bk25.persona_manager.get_current_persona().id if bk25.persona_manager.get_current_persona() else None,
+        "conversation_id": conversation_id
+    }
 
 @app.get("/api/conversations")
-async def get_conversations():
+async def get_conversations(request: Request):
     """Get all conversation summaries"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        conversations = bk25.get_all_conversations()
-        return {
-            "conversations": conversations,
-            "total_count": len(conversations)
-        }
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error loading conversations: {str(error)}")
+    conversations = bk25.get_all_conversations()
+    return {
+        "conversations": conversations,
+        "total_count": len(conversations)
+    }
 
 @app.get("/api/conversations/{conversation_id}")
-async def get_conversation(conversation_id: str, limit: Optional[int] = None):
+async def get_conversation(request: Request, conversation_id: str, limit: Optional[int] = None):
     """Get conversation history"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        history = bk25.get_conversation_history(conversation_id, limit)
-        return {
-            "conversation_id": conversation_id,
-            "messages": history,
-            "total_messages": len(history)
-        }
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error loading conversation: {str(error)}")
+    history = bk25.get_conversation_history(conversation_id, limit)
+    return {
+        "conversation_id": conversation_id,
+        "messages": history,
+        "total_messages": len(history)
+    }
 
 @app.get("/api/system/status")
-async def get_system_status():
+def get_system_status(request: Request):
     """Get overall system status"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        return bk25.get_system_status()
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting system status: {str(error)}")
+    return etag_response(request, bk25.get_system_status())
 
 @app.get("/api/system/memory")
-async def get_memory_info():
+def get_memory_info(request: Request):
     """Get memory information"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        return bk25.get_memory_info()
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting memory info: {str(error)}")
+    return etag_response(request, bk25.get_memory_info())
 
 # Code Generation Endpoints
 @app.post("/api/generate/script")
-async def generate_script(request: Request):
+async def generate_script(request: Request, body: GenerateScriptRequest):
     """Generate a script based on description and platform"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        body = await request.json()
-        description = body.get('description')
-        platform = body.get('platform', 'auto')
-        options = body.get('options')
-        
-        if not description:
-            raise HTTPException(status_code=400, detail="Description is required")
-        
-        result = await bk25.generate_script(description, platform, options)
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error generating script: {str(error)}")
+    if not body.description:
+        raise HTTPException(status_code=400, detail="Description is required")
+    
+    result = await bk25.generate_script(body.description, body.platform or 'auto', body.options)
+    return result
 
 @app.get("/api/generate/platforms")
-async def get_supported_platforms():
+def get_supported_platforms(request: Request):
     """Get supported code generation platforms"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        return bk25.get_code_generation_info()
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting platform info: {str(error)}")
+    return etag_response(request, bk25.get_code_generation_info())
 
 @app.get("/api/generate/platform/{platform}")
-async def get_platform_info(platform: str):
+def get_platform_info(request: Request, platform: str):
     """Get detailed information about a specific platform"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        info = bk25.get_platform_info(platform)
-        if not info:
-            raise HTTPException(status_code=404, detail=f"Platform {platform} not found")
-        
-        return info
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting platform info: {str(error)}")
+    info = bk25.get_platform_info(platform)
+    if not info:
+        raise HTTPException(status_code=404, detail=f"Platform {platform} not found")
+    
+    return etag_response(request, info)
 
 @app.post("/api/generate/suggestions")
-async def get_automation_suggestions(request: Request):
+def get_automation_suggestions(request: Request, body: SuggestionsRequest):
     """Get automation suggestions based on description"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        body = await request.json()
-        description = body.get('description')
-        if not description:
-            raise HTTPException(status_code=400, detail="Description is required")
-        
-        suggestions = bk25.get_automation_suggestions(description)
-        return {"suggestions": suggestions}
-        
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting suggestions: {str(error)}")
+    description = body.description
+    if not description:
+        raise HTTPException(status_code=400, detail="Description is required")
+    
+    suggestions = bk25.get_automation_suggestions(description)
+    return {"suggestions": suggestions}
 
 # Advanced LLM Features Endpoints
 @app.get("/api/llm/status")
-async def get_llm_status():
+async def get_llm_status(request: Request):
     """Get LLM system status and provider information"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        status = await bk25.get_llm_status()
-        return status
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting LLM status: {str(error)}")
+    status = await bk25.get_llm_status()
+    return status
 
 @app.get("/api/llm/providers/{provider_name}")
-async def get_llm_provider_info(provider_name: str):
+def get_llm_provider_info(request: Request, provider_name: str):
     """Get detailed information about a specific LLM provider"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        info = bk25.get_llm_provider_info(provider_name)
-        if not info:
-            raise HTTPException(status_code=404, detail=f"Provider {provider_name} not found")
-        
-        return info
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting provider info: {str(error)}")
+    info = bk25.get_llm_provider_info(provider_name)
+    if not info:
+        raise HTTPException(status_code=404, detail=f"Provider {provider_name} not found")
+    
+    return info
 
 @app.post("/api/llm/test")
-async def test_llm_generation(request: Request):
+async def test_llm_generation(request: Request, body: LLMTestRequest):
     """Test LLM generation with a simple prompt"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        body = await request.json()
-        prompt = body.get('prompt')
-        provider = body.get('provider')
-        
-        if not prompt:
-            raise HTTPException(status_code=400, detail="Prompt is required")
-        
-        result = await bk25.test_llm_generation(prompt, provider)
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error testing LLM: {str(error)}")
+    prompt = body.prompt
+    provider = body.provider
+    
+    if not prompt:
+        raise HTTPException(status_code=400, detail="Prompt is required")
+    
+    result = await bk25.test_llm_generation(prompt, provider)
+    return result
 
 @app.post("/api/scripts/improve")
-async def improve_script(request: Request):
+async def improve_script(request: Request, body: ImproveScriptRequest):
     """Improve an existing script based on feedback"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        body = await request.json()
-        script = body.get('script')
-        feedback = body.get('feedback')
-        platform = body.get('platform')
-        options = body.get('options')
-        
-        if not script or not feedback or not platform:
-            raise HTTPException(status_code=400, detail="Script, feedback, and platform are required")
-        
-        result = await bk25.improve_script(script, feedback, platform, options)
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error improving script: {str(error)}")
+    if not body.script or not body.feedback or not body.platform:
+        raise HTTPException(status_code=400, detail="Script, feedback, and platform are required")
+    
+    result = await bk25.improve_script(body.script, body.feedback, body.platform, body.options)
+    return result
 
 @app.post("/api/scripts/validate")
-async def validate_script(request: Request):
+async def validate_script(request: Request, body: ValidateScriptRequest):
     """Validate and analyze a script for quality and improvements"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        body = await request.json()
-        script = body.get('script')
-        platform = body.get('platform')
-        options = body.get('options')
-        
-        if not script or not platform:
-            raise HTTPException(status_code=400, detail="Script and platform are required")
-        
-        result = await bk25.validate_script(script, platform, options)
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error validating script: {str(error)}")
+    if not body.script or not body.platform:
+        raise HTTPException(status_code=400, detail="Script and platform are required")
+    
+    result = await bk25.validate_script(body.script, body.platform, body.options)
+    return result
 
 # Script Execution Endpoints
 @app.post("/api/execute/script")
-async def execute_script(request: Request):
+async def execute_script(request: Request, body: ExecuteScriptRequest):
     """Execute a script directly"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        body = await request.json()
-        script = body.get('script')
-        platform = body.get('platform')
-        filename = body.get('filename')
-        working_directory = body.get('working_directory')
-        timeout = body.get('timeout', 300)
-        policy = body.get('policy', 'safe')
-        environment = body.get('environment')
-        
-        if not script or not platform:
-            raise HTTPException(status_code=400, detail="Script and platform are required")
-        
-        result = await bk25.execute_script(
-            script=script,
-            platform=platform,
-            filename=filename,
-            working_directory=working_directory,
-            timeout=timeout,
-            policy=policy,
-            environment=environment
-        )
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error executing script: {str(error)}")
+    if not body.script or not body.platform:
+        raise HTTPException(status_code=400, detail="Script and platform are required")
+    
+    result = await bk25.execute_script(
+        script=body.script,
+        platform=body.platform,
+        filename=body.filename,
+        working_directory=body.working_directory,
+        timeout=300 if body.timeout is None else body.timeout,
+        policy=body.policy or 'safe',
+        environment=body.environment
+    )
+    return result
 
 @app.post("/api/execute/task")
-async def submit_execution_task(request: Request):
+async def submit_execution_task(request: Request, body: SubmitTaskRequest):
     """Submit a script execution task"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        body = await request.json()
-        name = body.get('name')
-        description = body.get('description')
-        script = body.get('script')
-        platform = body.get('platform')
-        priority = body.get('priority', 'normal')
-        tags = body.get('tags')
-        metadata = body.get('metadata')
-        
-        if not name or not description or not script or not platform:
-            raise HTTPException(status_code=400, detail="Name, description, script, and platform are required")
-        
-        result = await bk25.submit_execution_task(
-            name=name,
-            description=description,
-            script=script,
-            platform=platform,
-            priority=priority,
-            tags=tags,
-            metadata=metadata
-        )
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error submitting task: {str(error)}")
+    if not body.name or not body.description or not body.script or not body.platform:
+        raise HTTPException(status_code=400, detail="Name, description, script, and platform are required")
+    
+    result = await bk25.submit_execution_task(
+        name=body.name,
+        description=body.description,
+        script=body.script,
+        platform=body.platform,
+        priority=body.priority or 'normal',
+        tags=body.tags,
+        metadata=body.metadata
+    )
+    return result
 
 @app.get("/api/execute/task/{task_id}")
-async def get_task_status(task_id: str):
+async def get_task_status(request: Request, task_id: str):
     """Get the status of an execution task"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        result = await bk25.get_task_status(task_id)
-        return result
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting task status: {str(error)}")
+    result = await bk25.get_task_status(task_id)
+    return result
 
 @app.delete("/api/execute/task/{task_id}")
-async def cancel_execution_task(task_id: str):
+async def cancel_execution_task(request: Request, task_id: str):
     """Cancel an execution task"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        result = await bk25.cancel_execution_task(task_id)
-        return result
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error cancelling task: {str(error)}")
+    result = await bk25.cancel_execution_task(task_id)
+    return result
 
 @app.get("/api/execute/history")
 async def get_execution_history(
+    request: Request,
     limit: int = 100,
     status: Optional[str] = None,
     platform: Optional[str] = None,
     tag: Optional[str] = None
 ):
     """Get execution history with optional filters"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        result = await bk25.get_execution_history(
-            limit=limit,
-            status_filter=status,
-            platform_filter=platform,
-            tag_filter=tag
-        )
-        return result
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting execution history: {str(error)}")
+    result = await bk25.get_execution_history(
+        limit=limit,
+        status_filter=status,
+        platform_filter=platform,
+        tag_filter=tag
+    )
+    return result
 
 @app.get("/api/execute/statistics")
-async def get_execution_statistics():
+async def get_execution_statistics(request: Request):
     """Get system execution statistics"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        result = await bk25.get_system_statistics()
-        return result
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting statistics: {str(error)}")
+    result = await bk25.get_system_statistics()
+    return result
 
 @app.get("/api/execute/running")
-async def get_running_tasks():
+async def get_running_tasks(request: Request):
     """Get all currently running tasks"""
-    if not bk25:
-        raise HTTPException(status_code=503, detail="BK25 not initialized")
+    bk25 = request.state.bk25
     
-    try:
-        tasks = await bk25.execution_monitor.get_running_tasks()
-        
-        # Convert to serializable format
-        task_list = []
-        for task in tasks:
-            task_list.append({
-                'id': task.id,
-                'name': task.name,
-                'description': task.description,
-                'status': task.status.value,
-                'priority': task.priority.value,
-                'created_at': task.created_at.isoformat() if task.created_at else None,
-                'started_at': task.started_at.isoformat() if task.started_at else None,
-                'execution_time': task.execution_time,
-                'tags': task.tags,
-                'metadata': task.metadata
-            })
-        
-        return {
-            'success': True,
-            'running_tasks': task_list,
-            'total_count': len(task_list)
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Error getting running tasks: {str(error)}")
+    tasks = await bk25.execution_monitor.get_running_tasks()
+    
+    # Convert to serializable format
+    task_list = []
+    for task in tasks:
+        task_list.append({
+            'id': task.id,
+            'name': task.name,
+            'description': task.description,
+            'status': task.status.value,
+            'priority': task.priority.value,
+            'created_at': task.created_at_iso,
+            'started_at': task.started_at_iso,
+            'execution_time': task.execution_time,
+            'tags': task.tags,
+            'metadata': task.metadata
+        })
+    
+    return {
+        'success': True,
+        'running_tasks': task_list,
+        'total_count': len(task_list)
+    }
 
 # Custom 404 handler removed - let FastAPI handle 404 errors naturally
 
 # Custom 500 handler removed - let FastAPI handle 500 errors naturally
 
-# Catch-all route for debugging (only for non-API routes to avoid intercepting API tests)
-@app.get("/{path:path}")
-async def catch_all(path: str):
-    """Catch-all route for debugging"""
-    # Don't intercept API routes - let FastAPI handle 404s naturally
-    if path.startswith("api/"):
-        raise HTTPException(status_code=404, detail="API endpoint not found")
-    
-    return {
-        "message": f"Route not found: /{path}",
-        "available_routes": [
-            "/",
-            "/web/",
-            "/app",
-            "/info",
-            "/debug",
-            "/health",
-            "/docs"
-        ]
-    }
-
 if __name__ == "__main__":
     import argparse
     
@@ -1161,15 +1105,21 @@ if __name__ == "__main__":
     reload = args.reload if args.reload is not None else config.server.reload
     
     print(f"[SERVER] Starting BK25 on {host}:{port}")
+    # Reload mode only supports a single worker process
+    workers = 1 if reload else config.server.workers
+    
     print(f"[RELOAD] Reload mode: {reload}")
+    print(f"[WORKERS] Worker processes: {workers}")
     print(f"[CONFIG] Using configuration from: {config.paths.config_path}")
     print(f"[DOCS] API docs available at: http://{host}:{port}/docs")
     
-    # Start the server
+    # Start the server; uvicorn picks uvloop and httptools when they are installed
     uvicorn.run(
         "src.main:app",
         host=host,
         port=port,
         reload=reload,
-        log_level="info"
+        workers=workers,
+        log_level="info",
+        access_log=config.server.access_log
     )
@@ -3,1237 +3,1215 @@ API tests for FastAPI endpoints
 """
 
 import pytest
+import pytest_asyncio
 import json
-from unittest.mock import Mock, AsyncMock, patch
-from fastapi.testclient import TestClient
+import asyncio
+from typing import Final
+from types import SimpleNamespace
+from unittest.mock import Mock, MagicMock, AsyncMock
+import httpx
 from fastapi import FastAPI
 from src.main import app
 
 
-class TestFastAPIEndpoints:
-    """Test all FastAPI API endpoints"""
-
-    @pytest.fixture
-    def client(self):
-        """Create test client"""
-        return TestClient(app)
-
-    @pytest.fixture
-    def mock_bk25_core(self):
-        """Mock BK25Core instance"""
-        with patch('src.main.bk25', create=True) as mock_bk25:
-            # Also patch the module attribute directly
-            import src.main
-            src.main.bk25 = mock_bk25
-            # Mock persona manager
-            mock_persona = Mock()
-            mock_persona.id = "test-persona"
-            mock_persona.name = "Test Persona"
-            mock_persona.description = "A test persona"
-            mock_persona.greeting = "Hello!"
-            mock_persona.capabilities = ["testing"]
-            mock_persona.personality = Mock(
-                tone="friendly",
-                approach="helpful",
-                philosophy="testing",
-                motto="Test everything"
-            )
-            mock_persona.examples = ["Test example"]
-            mock_persona.channels = ["web"]
-            
-            mock_bk25.persona_manager.get_current_persona.return_value = mock_persona
-            mock_bk25.persona_manager.get_all_personas.return_value = [mock_persona]
-            mock_bk25.persona_manager.get_personas_for_channel.return_value = [mock_persona]
-            mock_bk25.persona_manager.get_persona.return_value = mock_persona
-            mock_bk25.persona_manager.switch_persona.return_value = mock_persona
-            # Mock add_custom_persona to return a persona with the data passed in
-            def mock_add_custom_persona(persona_data):
-                mock_new_persona = Mock()
-                mock_new_persona.id = persona_data.get("id", f"custom-{persona_data['name'].lower().replace(' ', '-')}")
-                mock_new_persona.name = persona_data["name"]
-                mock_new_persona.description = persona_data["description"]
-                mock_new_persona.personality = Mock(
-                    tone=persona_data["personality"]["tone"],
-                    approach=persona_data["personality"]["approach"],
-                    philosophy=persona_data["personality"]["philosophy"],
-                    motto=persona_data["personality"]["motto"]
-                )
-                mock_new_persona.capabilities = persona_data.get("capabilities", [])
-                mock_new_persona.examples = persona_data.get("examples", [])
-                mock_new_persona.channels = persona_data.get("channels", ["web"])
-                return mock_new_persona
-            
-            mock_bk25.persona_manager.add_custom_persona = mock_add_custom_persona
-            
-            # Mock channel manager
-            mock_channel = Mock()
-            mock_channel.id = "test-channel"
-            mock_channel.name = "Test Channel"
-            mock_channel.description = "A test channel"
-            mock_channel.capabilities = {
-                "text": Mock(supported=True, description="Text messaging")
-            }
-            mock_channel.artifact_types = ["text"]
-            mock_channel.metadata = {"test": True}
-            
-            # Mock channel manager methods
-            mock_bk25.channel_manager.get_current_channel = Mock(return_value=mock_channel)
-            mock_bk25.channel_manager.get_all_channels = Mock(return_value=[mock_channel])
-            mock_bk25.channel_manager.get_channel = Mock(return_value=mock_channel)
-            mock_bk25.channel_manager.switch_channel = Mock(return_value=mock_channel)
-            mock_bk25.channel_manager.current_channel = "test-channel"
-            
-            # Mock system status
-            mock_bk25.get_system_status.return_value = {
-                "ollama_connected": False,
-                "personas_loaded": 1,
-                "channels_available": 1,
-                "conversations_active": 1
-            }
-            
-            # Mock memory
-            mock_bk25.get_all_conversations.return_value = [
-                {"id": "conv1", "summary": "Test conversation"}
-            ]
-            mock_bk25.get_conversation_history.return_value = [
-                {"role": "user", "content": "Hello", "timestamp": "2025-01-27T10:00:00Z"}
-            ]
-            mock_bk25.get_memory_info.return_value = {
-                "conversations": 1,
-                "messages": 1
-            }
-            
-            # Mock code generation
-            mock_bk25.get_code_generation_info.return_value = {
-                "platforms": ["powershell", "bash", "applescript"]
-            }
-            mock_bk25.get_platform_info.return_value = {
-                "name": "powershell",
-                "description": "PowerShell scripting"
-            }
-            mock_bk25.get_automation_suggestions.return_value = [
-                "Backup files", "Process data"
-            ]
-            
-            # Mock LLM
-            mock_bk25.get_llm_status.return_value = {
-                "providers": ["ollama"],
-                "current_provider": "ollama"
-            }
-            mock_bk25.get_llm_provider_info.return_value = {
-                "name": "ollama",
-                "status": "disconnected"
-            }
-            
-            # Mock script management
-            mock_bk25.improve_script.return_value = {
-                "improved_script": "Improved version",
-                "changes": ["Added error handling"]
-            }
-            mock_bk25.validate_script.return_value = {
-                "valid": True,
-                "suggestions": ["Add logging"]
-            }
-            
-            # Mock execution
-            mock_bk25.execute_script.return_value = {
-                "success": True,
-                "output": "Script executed successfully"
-            }
-            mock_bk25.submit_execution_task.return_value = {
-                "task_id": "task-123",
-                "status": "submitted"
-            }
-            mock_bk25.get_task_status.return_value = {
-                "id": "task-123",
-                "status": "completed"
-            }
-            mock_bk25.cancel_execution_task.return_value = {
-                "success": True,
-                "message": "Task cancelled"
-            }
-            mock_bk25.get_execution_history.return_value = [
-                {"id": "task-123", "status": "completed"}
-            ]
-            mock_bk25.get_system_statistics.return_value = {
-                "total_tasks": 1,
-                "completed_tasks": 1
-            }
-            
-            # Mock execution monitor
-            mock_execution_monitor = Mock()
-            mock_task = Mock()
-            mock_task.id = "task-123"
-            mock_task.name = "Test Task"
-            mock_task.description = "Test description"
-            mock_task.status.value = "completed"
-            mock_task.priority.value = "normal"
-            mock_task.created_at = None
-            mock_task.started_at = None
-            mock_task.execution_time = 1.0
-            mock_task.exit_code = 0
-            mock_task.output = "Test output"
-            mock_task.error = None
-            mock_task.tags = ["test"]
-            mock_task.metadata = {"test": True}
-            
-            mock_execution_monitor.get_running_tasks.return_value = [mock_task]
-            mock_bk25.execution_monitor = mock_execution_monitor
-            
-            # Mock missing methods that endpoints call
-            mock_bk25.generate_script = AsyncMock(return_value={
-                "script": "echo 'Hello World'",
-                "platform": "bash",
-                "description": "Test script"
-            })
-            
-            mock_bk25.get_platform_info = Mock(return_value={
-                "name": "powershell",
-                "description": "PowerShell scripting"
-            })
-            
-            mock_bk25.get_automation_suggestions = Mock(return_value=[
-                "Backup files", "Process data"
-            ])
-            
-            mock_bk25.get_llm_status = AsyncMock(return_value={
-                "providers": ["ollama"],
-                "current_provider": "ollama",
-                "status": "connected"
-            })
-            
-            mock_bk25.get_llm_provider_info = Mock(return_value={
-                "name": "ollama",
-                "status": "connected"
-            })
-            
-            mock_bk25.test_llm_generation = AsyncMock(return_value={
-                "success": True,
-                "response": "Test response"
-            })
-            
-            mock_bk25.improve_script = AsyncMock(return_value={
-                "improved_script": "Improved version",
-                "changes": ["Added error handling"]
-            })
-            
-            mock_bk25.validate_script = AsyncMock(return_value={
-                "valid": True,
-                "suggestions": ["Add logging"]
-            })
-            
-            mock_bk25.execute_script = AsyncMock(return_value={
-                "success": True,
-                "output": "Script executed successfully"
-            })
-            
-            mock_bk25.submit_execution_task = AsyncMock(return_value={
-                "task_id": "task-123",
-                "status": "submitted"
-            })
-            
-            mock_bk25.get_task_status = AsyncMock(return_value={
-                "id": "task-123",
-                "status": "completed"
-            })
-            
-            mock_bk25.cancel_execution_task = AsyncMock(return_value={
-                "success": True,
-                "message": "Task cancelled"
-            })
-            
-            mock_bk25.get_execution_history = AsyncMock(return_value=[
-                {"id": "task-123", "status": "completed"}
-            ])
-            
-            mock_bk25.get_system_statistics = AsyncMock(return_value={
-                "total_tasks": 1,
-                "completed_tasks": 1
-            })
-            
-            yield mock_bk25
-
-    def test_health_check(self, client, mock_bk25_core):
-        """Test health check endpoint"""
-        response = client.get("/health")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["status"] == "healthy"
-        assert data["version"] == "1.0.0"
-        assert "migration_status" in data
-
-    def test_get_personas(self, client, mock_bk25_core):
-        """Test get personas endpoint"""
-        response = client.get("/api/personas")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "personas" in data
-        assert "current_persona" in data
-        assert "total_count" in data
-        assert len(data["personas"]) == 1
-        assert data["personas"][0]["id"] == "test-persona"
-
-    def test_get_personas_with_channel(self, client, mock_bk25_core):
-        """Test get personas endpoint with channel parameter"""
-        response = client.get("/api/personas?channel=web")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert len(data["personas"]) == 1
-        assert data["personas"][0]["channels"] == ["web"]
-
-    def test_get_current_persona(self, client, mock_bk25_core):
-        """Test get current persona endpoint"""
-        response = client.get("/api/personas/current")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["id"] == "test-persona"
-        assert data["name"] == "Test Persona"
-        assert "personality" in data
-
-    def test_get_persona_by_id(self, client, mock_bk25_core):
-        """Test get persona by ID endpoint"""
-        response = client.get("/api/personas/test-persona")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["id"] == "test-persona"
-        assert data["name"] == "Test Persona"
-
-    def test_switch_persona(self, client, mock_bk25_core):
-        """Test switch persona endpoint"""
-        response = client.post("/api/personas/test-persona/switch")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "message" in data
-        assert "persona" in data
-
-    def test_create_persona(self, client, mock_bk25_core):
-        """Test create persona endpoint"""
-        persona_data = {
-            "name": "New Persona",
-            "description": "A new test persona",
-            "personality": {
-                "tone": "friendly",
-                "approach": "helpful",
-                "philosophy": "testing",
-                "motto": "Test everything"
-            }
-        }
-        
-        response = client.post("/api/personas/create", json=persona_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "message" in data
-        assert "persona" in data
-        assert data["persona"]["name"] == "New Persona"
-
-    def test_create_persona_missing_fields(self, client, mock_bk25_core):
-        """Test create persona endpoint with missing fields"""
-        incomplete_data = {
-            "name": "Incomplete Persona"
-            # Missing description and personality
+# Every endpoint test drives the app through an async client
+pytestmark = pytest.mark.asyncio
+
+# Module attribute the tests swap the BK25 core into
+_BK25_TARGET: Final = "src.main.bk25"
+
+# Endpoints hit several times across the tests
+SETTINGS_URL: Final = "/api/settings"
+SETTINGS_TEST_URL: Final = "/api/settings/test"
+PLATFORMS_URL: Final = "/api/generate/platforms"
+HISTORY_URL: Final = "/api/execute/history"
+
+# Request bodies for the POST endpoint tests
+PERSONA_DATA: Final = {
+    "name": "New Persona",
+    "description": "A new test persona",
+    "personality": {
+        "tone": "friendly",
+        "approach": "helpful",
+        "philosophy": "testing",
+        "motto": "Test everything"
+    }
+}
+
+PERSONA_DATA_INCOMPLETE: Final = {
+    "name": "Incomplete Persona"
+    # Missing description and personality
+}
+
+CHAT_DATA: Final = {
+    "message": "Hello, how are you?",
+    "conversation_id": "test-conv"
+}
+
+CHAT_DATA_NO_MESSAGE: Final = {
+    "conversation_id": "test-conv"
+    # Missing message
+}
+
+GENERATE_DATA: Final = {
+    "prompt": "Create a backup script",
+    "conversation_id": "test-conv"
+}
+
+GENERATE_DATA_NO_PROMPT: Final = {
+    "conversation_id": "test-conv"
+    # Missing prompt
+}
+
+SCRIPT_DATA: Final = {
+    "description": "Backup script",
+    "platform": "powershell"
+}
+
+SCRIPT_DATA_NO_DESCRIPTION: Final = {
+    "platform": "powershell"
+    # Missing description
+}
+
+SUGGESTION_DATA: Final = {
+    "description": "File management"
+}
+
+SUGGESTION_DATA_NO_DESCRIPTION: Final = {}
+
+LLM_TEST_DATA: Final = {
+    "prompt": "Hello, how are you?",
+    "provider": "ollama"
+}
+
+LLM_TEST_DATA_NO_PROMPT: Final = {
+    "provider": "ollama"
+    # Missing prompt
+}
+
+IMPROVE_DATA: Final = {
+    "script": "Write-Host 'Hello'",
+    "feedback": "Add error handling",
+    "platform": "powershell"
+}
+
+IMPROVE_DATA_INCOMPLETE: Final = {
+    "script": "Write-Host 'Hello'"
+    # Missing feedback and platform
+}
+
+VALIDATE_DATA: Final = {
+    "script": "Write-Host 'Hello'",
+    "platform": "powershell"
+}
+
+VALIDATE_DATA_INCOMPLETE: Final = {
+    "script": "Write-Host 'Hello'"
+    # Missing platform
+}
+
+EXECUTE_DATA: Final = {
+    "script": "echo 'Hello World'",
+    "platform": "bash"
+}
+
+EXECUTE_DATA_INCOMPLETE: Final = {
+    "script": "echo 'Hello World'"
+    # Missing platform
+}
+
+TASK_DATA: Final = {
+    "name": "Test Task",
+    "description": "A test execution task",
+    "script": "echo 'Hello World'",
+    "platform": "bash"
+}
+
+TASK_DATA_INCOMPLETE: Final = {
+    "name": "Test Task"
+    # Missing description, script, and platform
+}
+
+
+# (url, incomplete body, expected error detail) for the missing-field tests
+MISSING_FIELD_CASES: Final = (
+    ("/api/personas/create", PERSONA_DATA_INCOMPLETE, "Missing required field"),
+    ("/api/chat", CHAT_DATA_NO_MESSAGE, "Message is required"),
+    ("/api/generate", GENERATE_DATA_NO_PROMPT, "Prompt is required"),
+    ("/api/generate/script", SCRIPT_DATA_NO_DESCRIPTION, "Description is required"),
+    ("/api/generate/suggestions", SUGGESTION_DATA_NO_DESCRIPTION, "Description is required"),
+    ("/api/llm/test", LLM_TEST_DATA_NO_PROMPT, "Prompt is required"),
+    ("/api/scripts/improve", IMPROVE_DATA_INCOMPLETE, "Script, feedback, and platform are required"),
+    ("/api/scripts/validate", VALIDATE_DATA_INCOMPLETE, "Script and platform are required"),
+    ("/api/execute/script", EXECUTE_DATA_INCOMPLETE, "Script and platform are required"),
+    ("/api/execute/task", TASK_DATA_INCOMPLETE, "Name, description, script, and platform are required"),
+)
+
+
+# Static task reported by the mock execution monitor
+_TASK: Final = SimpleNamespace(
+    id="task-123",
+    name="Test Task",
+    description="Test description",
+    status=SimpleNamespace(value="completed"),
+    priority=SimpleNamespace(value="normal"),
+    created_at=None,
+    started_at=None,
+    created_at_iso=None,
+    started_at_iso=None,
+    execution_time=1.0,
+    exit_code=0,
+    output="Test output",
+    error=None,
+    tags=["test"],
+    metadata={"test": True}
+)
+
+
+@pytest.fixture(scope="session")
+def _mock_persona_manager():
+    """Mock persona manager serving a single test persona"""
+    persona_manager = MagicMock()
+    
+    mock_persona = SimpleNamespace(
+        id="test-persona",
+        name="Test Persona",
+        description="A test persona",
+        greeting="Hello!",
+        capabilities=["testing"],
+        personality=SimpleNamespace(
+            tone="friendly",
+            approach="helpful",
+            philosophy="testing",
+            motto="Test everything"
+        ),
+        examples=["Test example"],
+        channels=["web"]
+    )
+    
+    persona_manager.get_current_persona.return_value = mock_persona
+    persona_manager.get_all_personas.return_value = [mock_persona]
+    persona_manager.get_personas_for_channel.return_value = [mock_persona]
+    persona_manager.get_persona.return_value = mock_persona
+    persona_manager.switch_persona.return_value = mock_persona
+    # Mock add_custom_persona to return a persona with the data passed in
+    def mock_add_custom_persona(persona_data):
+        return SimpleNamespace(
+            id=persona_data.get("id", f"custom-{persona_data['name'].lower().replace(' ', '-')}"),
+            name=persona_data["name"],
+            description=persona_data["description"],
+            personality=SimpleNamespace(
+                tone=persona_data["personality"]["tone"],
+                approach=persona_data["personality"]["approach"],
+                philosophy=persona_data["personality"]["philosophy"],
+                motto=persona_data["personality"]["motto"]
+            ),
+            capabilities=persona_data.get("capabilities", []),
+            examples=persona_data.get("examples", []),
+            channels=persona_data.get("channels", ["web"])
+        )
+    
+    persona_manager.add_custom_persona = mock_add_custom_persona
+    return persona_manager
+
+
+@pytest.fixture(scope="session")
+def _mock_channel_manager():
+    """Mock channel manager serving a single test channel"""
+    channel_manager = MagicMock()
+    
+    mock_channel = SimpleNamespace(
+        id="test-channel",
+        name="Test Channel",
+        description="A test channel",
+        capabilities={
+            "text": SimpleNamespace(supported=True, description="Text messaging")
+        },
+        artifact_types=["text"],
+        metadata={"test": True}
+    )
+    
+    channel_manager.get_current_channel = Mock(return_value=mock_channel)
+    channel_manager.get_all_channels = Mock(return_value=[mock_channel])
+    channel_manager.get_channel = Mock(return_value=mock_channel)
+    channel_manager.switch_channel = Mock(return_value=mock_channel)
+    channel_manager.current_channel = "test-channel"
+    return channel_manager
+
+
+@pytest.fixture(scope="session")
+def _mock_execution_monitor():
+    """Mock execution monitor with one running task"""
+    execution_monitor = Mock()
+    execution_monitor.get_running_tasks.return_value = [_TASK]
+    return execution_monitor
+
+
+@pytest.fixture(scope="session")
+def _mock_bk25_template(_mock_persona_manager, _mock_channel_manager, _mock_execution_monitor):
+    """Build the mock BK25Core once; tests override attributes through monkeypatch"""
+    mock_bk25 = MagicMock()
+    mock_bk25.persona_manager = _mock_persona_manager
+    mock_bk25.channel_manager = _mock_channel_manager
+    mock_bk25.execution_monitor = _mock_execution_monitor
+    
+    # Mock system status
+    mock_bk25.get_system_status.return_value = {
+        "ollama_connected": False,
+        "personas_loaded": 1,
+        "channels_available": 1,
+        "conversations_active": 1
+    }
+    
+    # Mock memory
+    mock_bk25.get_all_conversations.return_value = [
+        {"id": "conv1", "summary": "Test conversation"}
+    ]
+    mock_bk25.get_conversation_history.return_value = [
+        {"role": "user", "content": "Hello", "timestamp": "2025-01-27T10:00:00Z"}
+    ]
+    mock_bk25.get_memory_info.return_value = {
+        "conversations": 1,
+        "messages": 1
+    }
+    
+    # Mock code generation
+    mock_bk25.get_code_generation_info.return_value = {
+        "platforms": ["powershell", "bash", "applescript"]
+    }
+    
+    # Mock missing methods that endpoints call
+    mock_bk25.generate_script = AsyncMock(return_value={
+        "script": "echo 'Hello World'",
+        "platform": "bash",
+        "description": "Test script"
+    })
+    
+    mock_bk25.get_platform_info = Mock(return_value={
+        "name": "powershell",
+        "description": "PowerShell scripting"
+    })
+    
+    mock_bk25.get_automation_suggestions = Mock(return_value=[
+        "Backup files", "Process data"
+    ])
+    
+    mock_bk25.get_llm_status = AsyncMock(return_value={
+        "providers": ["ollama"],
+        "current_provider": "ollama",
+        "status": "connected"
+    })
+    
+    mock_bk25.get_llm_provider_info = Mock(return_value={
+        "name": "ollama",
+        "status": "connected"
+    })
+    
+    mock_bk25.test_llm_generation = AsyncMock(return_value={
+        "success": True,
+        "response": "Test response"
+    })
+    
+    mock_bk25.improve_script = AsyncMock(return_value={
+        "improved_script": "Improved version",
+        "changes": ["Added error handling"]
+    })
+    
+    mock_bk25.validate_script = AsyncMock(return_value={
+        "valid": True,
+        "suggestions": ["Add logging"]
+    })
+    
+    mock_bk25.execute_script = AsyncMock(return_value={
+        "success": True,
+        "output": "Script executed successfully"
+    })
+    
+    mock_bk25.submit_execution_task = AsyncMock(return_value={
+        "task_id": "task-123",
+        "status": "submitted"
+    })
+    
+    mock_bk25.get_task_status = AsyncMock(return_value={
+        "id": "task-123",
+        "status": "completed"
+    })
+    
+    mock_bk25.cancel_execution_task = AsyncMock(return_value={
+        "success": True,
+        "message": "Task cancelled"
+    })
+    
+    mock_bk25.get_execution_history = AsyncMock(return_value={
+        "success": True,
+        "tasks": [{"id": "task-123", "status": "completed"}],
+        "total_count": 1
+    })
+    
+    mock_bk25.get_system_statistics = AsyncMock(return_value={
+        "total_tasks": 1,
+        "completed_tasks": 1
+    })
+    
+    return mock_bk25
+
+
+@pytest_asyncio.fixture
+async def client():
+    """Create the async test client for one endpoint test
+    
+    The client calls the app directly on the test's event loop and is
+    closed once the test finishes.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def mock_bk25_core(_mock_bk25_template, monkeypatch):
+    """Install the shared mock BK25Core for every test"""
+    monkeypatch.setattr(_BK25_TARGET, _mock_bk25_template)
+    yield _mock_bk25_template
+
+
+@pytest.mark.parametrize("url,required_keys,expected", [
+    ("/health", ("migration_status",), {"status": "healthy", "version": "1.0.0"}),
+    ("/api/personas", ("personas", "current_persona"), {"total_count": 1}),
+    ("/api/personas/current", ("personality",), {"id": "test-persona", "name": "Test Persona"}),
+    ("/api/personas/test-persona", (), {"id": "test-persona", "name": "Test Persona"}),
+    ("/api/channels", ("channels", "current_channel"), {"total_count": 1}),
+    ("/api/channels/current", ("capabilities",), {"id": "test-channel", "name": "Test Channel"}),
+    ("/api/channels/test-channel", (), {"id": "test-channel", "name": "Test Channel"}),
+    ("/api/conversations", ("conversations",), {"total_count": 1}),
+    ("/api/conversations/conv1", ("conversation_id", "messages", "total_messages"), {}),
+    ("/api/conversations/conv1?limit=5", ("conversation_id", "messages"), {}),
+    ("/api/system/status", ("ollama_connected", "personas_loaded", "channels_available"), {}),
+    ("/api/system/memory", ("conversations", "messages"), {}),
+    (PLATFORMS_URL, (), {"platforms": ["powershell", "bash", "applescript"]}),
+    ("/api/generate/platform/powershell", ("name", "description"), {}),
+    ("/api/llm/status", ("providers", "current_provider"), {}),
+    ("/api/llm/providers/ollama", ("name", "status"), {}),
+    ("/api/execute/task/task-123", ("id", "status"), {}),
+    ("/api/execute/statistics", ("total_tasks", "completed_tasks"), {}),
+    ("/openapi.json", ("openapi", "paths"), {}),
+    ("/docs", (), {}),
+    ("/redoc", (), {}),
+])
+async def test_get_endpoints(client, mock_bk25_core, url, required_keys, expected):
+    """Test read-only GET endpoints return the expected fields"""
+    response = await client.get(url)
+    assert response.status_code == 200
+    if not required_keys and not expected:
+        # HTML pages such as the API docs only need to be served
+        return
+    
+    data = response.json()
+    for key in required_keys:
+        assert key in data
+    for key, value in expected.items():
+        assert data[key] == value
+
+
+async def test_get_personas_with_channel(client, mock_bk25_core):
+    """Test get personas endpoint with channel parameter"""
+    response = await client.get("/api/personas?channel=web")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert len(data["personas"]) == 1
+    assert data["personas"][0]["channels"] == ["web"]
+
+
+async def test_switch_persona(client, mock_bk25_core):
+    """Test switch persona endpoint"""
+    response = await client.post("/api/personas/test-persona/switch")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "message" in data
+    assert "persona" in data
+
+
+async def test_create_persona(client, mock_bk25_core):
+    """Test create persona endpoint"""
+    response = await client.post("/api/personas/create", json=PERSONA_DATA)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "message" in data
+    assert "persona" in data
+    assert data["persona"]["name"] == "New Persona"
+
+
+@pytest.mark.parametrize("url,body,expected", MISSING_FIELD_CASES)
+async def test_missing_required_fields(client, mock_bk25_core, url, body, expected):
+    """Test POST endpoints reject bodies without their required fields"""
+    response = await client.post(url, json=body)
+    assert response.status_code == 400
+    assert expected in response.json().get("detail", "")
+
+
+async def test_switch_channel(client, mock_bk25_core):
+    """Test switch channel endpoint"""
+    response = await client.post("/api/channels/test-channel/switch")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "message" in data
+    assert "channel" in data
+
+
+async def test_chat_endpoint(client, mock_bk25_core, monkeypatch):
+    """Test chat endpoint"""
+    # Mock process_message method
+    monkeypatch.setattr(mock_bk25_core, "process_message", AsyncMock(return_value={
+        "response": "Hello! I'm doing well, thank you.",
+        "persona": {"id": "test-persona"},
+        "channel": {"id": "test-channel"},
+        "conversation_id": "test-conv"
+    }))
+    
+    response = await client.post("/api/chat", json=CHAT_DATA)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "response" in data
+    assert "persona" in data
+    assert "channel" in data
+
+
+async def test_generate_automation(client, mock_bk25_core, monkeypatch):
+    """Test generate automation endpoint"""
+    # Mock generate_completion method
+    monkeypatch.setattr(mock_bk25_core, "generate_completion", AsyncMock(return_value="Generated script content"))
+    
+    response = await client.post("/api/generate", json=GENERATE_DATA)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "generated_code" in data
+    assert "persona" in data
+
+
+@pytest.mark.parametrize("url,body,method,return_value", [
+    ("/api/chat", CHAT_DATA, "process_message", {"response": "Hi"}),
+    ("/api/generate", GENERATE_DATA, "generate_completion", "Generated script content"),
+])
+async def test_null_conversation_id_uses_default(client, mock_bk25_core, monkeypatch, url, body, method, return_value):
+    """Test chat and generate endpoints treat a null conversation_id as the default one"""
+    core_method = AsyncMock(return_value=return_value)
+    monkeypatch.setattr(mock_bk25_core, method, core_method)
+    
+    response = await client.post(url, json={**body, "conversation_id": None})
+    assert response.status_code == 200
+    
+    assert core_method.await_args.args[1] == "default"
+
+
+async def test_create_persona_null_lists(client, mock_bk25_core):
+    """Test create persona endpoint treats null list fields as their defaults"""
+    response = await client.post(
+        "/api/personas/create",
+        json={**PERSONA_DATA, "examples": None, "channels": None}
+    )
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["persona"]["channels"] == ["web"]
+
+
+async def test_generate_script(client, mock_bk25_core, monkeypatch):
+    """Test generate script endpoint"""
+    # Mock generate_script method
+    monkeypatch.setattr(mock_bk25_core, "generate_script", AsyncMock(return_value={
+        "script": "Write-Host 'Backup script'",
+        "platform": "powershell"
+    }))
+    
+    response = await client.post("/api/generate/script", json=SCRIPT_DATA)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "script" in data
+    assert "platform" in data
+
+
+async def test_get_supported_platforms_not_modified(client, mock_bk25_core):
+    """Test cacheable endpoints answer 304 when the ETag still matches"""
+    response = await client.get(PLATFORMS_URL)
+    etag = response.headers["etag"]
+    
+    response = await client.get(PLATFORMS_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    
+    response = await client.get(PLATFORMS_URL, headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert "platforms" in response.json()
+
+
+async def test_get_platform_info_not_found(client, mock_bk25_core, monkeypatch):
+    """Test get platform info endpoint for non-existent platform"""
+    # Mock to return None for non-existent platform
+    monkeypatch.setattr(mock_bk25_core.get_platform_info, "return_value", None)
+    
+    response = await client.get("/api/generate/platform/nonexistent")
+    assert response.status_code == 404
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Platform nonexistent not found" in data["detail"]
+
+
+async def test_get_automation_suggestions(client, mock_bk25_core):
+    """Test get automation suggestions endpoint"""
+    response = await client.post("/api/generate/suggestions", json=SUGGESTION_DATA)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "suggestions" in data
+    assert len(data["suggestions"]) >= 1
+
+
+async def test_get_llm_provider_info_not_found(client, mock_bk25_core, monkeypatch):
+    """Test get LLM provider info endpoint for non-existent provider"""
+    # Mock to return None for non-existent provider
+    monkeypatch.setattr(mock_bk25_core.get_llm_provider_info, "return_value", None)
+    
+    response = await client.get("/api/llm/providers/nonexistent")
+    assert response.status_code == 404
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Provider nonexistent not found" in data["detail"]
+
+
+async def test_test_llm_generation(client, mock_bk25_core, monkeypatch):
+    """Test test LLM generation endpoint"""
+    # Mock test_llm_generation method
+    monkeypatch.setattr(mock_bk25_core, "test_llm_generation", AsyncMock(return_value={
+        "success": True,
+        "response": "Hello! I'm doing well, thank you for asking."
+    }))
+    
+    response = await client.post("/api/llm/test", json=LLM_TEST_DATA)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "success" in data
+    assert "response" in data
+
+
+async def test_improve_script(client, mock_bk25_core):
+    """Test improve script endpoint"""
+    response = await client.post("/api/scripts/improve", json=IMPROVE_DATA)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "improved_script" in data
+    assert "changes" in data
+
+
+async def test_validate_script(client, mock_bk25_core):
+    """Test validate script endpoint"""
+    response = await client.post("/api/scripts/validate", json=VALIDATE_DATA)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "valid" in data
+    assert "suggestions" in data
+
+
+async def test_execute_script(client, mock_bk25_core):
+    """Test execute script endpoint"""
+    response = await client.post("/api/execute/script", json=EXECUTE_DATA)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "success" in data
+    assert "output" in data
+
+
+async def test_execute_script_null_defaults(client, mock_bk25_core, monkeypatch):
+    """Test execute script endpoint treats explicit nulls as the defaults"""
+    execute_script = AsyncMock(return_value={"success": True, "output": ""})
+    monkeypatch.setattr(mock_bk25_core, "execute_script", execute_script)
+    
+    response = await client.post(
+        "/api/execute/script",
+        json={**EXECUTE_DATA, "timeout": None, "policy": None}
+    )
+    assert response.status_code == 200
+    
+    kwargs = execute_script.await_args.kwargs
+    assert kwargs["timeout"] == 300
+    assert kwargs["policy"] == "safe"
+
+
+async def test_submit_execution_task(client, mock_bk25_core):
+    """Test submit execution task endpoint"""
+    response = await client.post("/api/execute/task", json=TASK_DATA)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "task_id" in data
+    assert "status" in data
+
+
+async def test_cancel_execution_task(client, mock_bk25_core):
+    """Test cancel execution task endpoint"""
+    response = await client.delete("/api/execute/task/task-123")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "success" in data
+    assert "message" in data
+
+
+async def test_get_execution_history(client, mock_bk25_core):
+    """Test get execution history endpoint"""
+    response = await client.get(HISTORY_URL)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["success"] is True
+    assert data["total_count"] == 1
+    assert data["tasks"][0]["id"] == "task-123"
+
+
+async def test_get_execution_history_with_filters(client, mock_bk25_core, monkeypatch):
+    """Test get execution history endpoint with filters"""
+    get_history = AsyncMock(return_value={"success": True, "tasks": [], "total_count": 0})
+    monkeypatch.setattr(mock_bk25_core, "get_execution_history", get_history)
+    
+    response = await client.get("/api/execute/history?limit=10&status=completed&platform=bash")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert isinstance(data["tasks"], list)
+    get_history.assert_awaited_once_with(
+        limit=10,
+        status_filter="completed",
+        platform_filter="bash",
+        tag_filter=None
+    )
+
+
+async def test_large_responses_are_gzipped(client, mock_bk25_core, monkeypatch):
+    """Test large responses are compressed and small ones are not"""
+    tasks = [{"id": f"task-{i}", "status": "completed"} for i in range(500)]
+    monkeypatch.setattr(mock_bk25_core, "get_execution_history", AsyncMock(return_value={
+        "success": True,
+        "tasks": tasks,
+        "total_count": len(tasks)
+    }))
+    
+    response = await client.get(HISTORY_URL, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["tasks"]) == 500
+    
+    health_response = await client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in health_response.headers
+
+
+async def test_get_execution_history_failure(client, mock_bk25_core, monkeypatch):
+    """Test get execution history endpoint reports core failures in the envelope"""
+    monkeypatch.setattr(mock_bk25_core, "get_execution_history", AsyncMock(return_value={
+        "success": False,
+        "error": "Invalid status filter: bogus"
+    }))
+    
+    response = await client.get("/api/execute/history?status=bogus")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["success"] is False
+    assert "Invalid status filter: bogus" in data["error"]
+
+
+@pytest.mark.xfail(reason="Mock setup issue with execution monitor - needs investigation")
+async def test_get_running_tasks(client, mock_bk25_core):
+    """Test get running tasks endpoint"""
+    response = await client.get("/api/execute/running")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "success" in data
+    assert "running_tasks" in data
+    assert "total_count" in data
+
+
+async def test_404_handler(client, mock_bk25_core):
+    """Test 404 error handler"""
+    response = await client.get("/api/nonexistent")
+    assert response.status_code == 404
+    
+    data = response.json()
+    # FastAPI returns a standard 404 format
+    assert "detail" in data
+    assert "API endpoint not found" in data["detail"]
+
+
+@pytest.mark.parametrize("method,url", [
+    ("POST", "/api/personas"),
+    ("DELETE", "/api/channels"),
+    ("PUT", SETTINGS_URL),
+])
+async def test_405_wrong_method_on_existing_route(client, mock_bk25_core, method, url):
+    """Test a wrong method on a real API route is a 405, not an API 404"""
+    response = await client.request(method, url)
+    assert response.status_code == 405
+    assert "allow" in response.headers
+
+
+async def test_404_handler_non_api_route(client):
+    """Test unknown non-API routes get the debugging hint"""
+    response = await client.get("/no/such/page")
+    assert response.status_code == 404
+    
+    data = response.json()
+    assert data["message"] == "Route not found: /no/such/page"
+    assert "/health" in data["available_routes"]
+
+
+async def test_503_when_not_initialized(client, monkeypatch):
+    """Test API endpoints are rejected until BK25 is initialized"""
+    monkeypatch.setattr(_BK25_TARGET, None)
+    
+    response = await client.get("/api/personas")
+    assert response.status_code == 503
+    
+    data = response.json()
+    assert data["detail"] == "BK25 not initialized"
+
+
+async def test_500_handler(client, mock_bk25_core, monkeypatch):
+    """Test 500 error handler"""
+    # Mock a method to raise an exception
+    monkeypatch.setattr(mock_bk25_core.get_system_status, "side_effect", Exception("Test error"))
+
+    response = await client.get("/api/system/status")
+    assert response.status_code == 500
+
+    data = response.json()
+    # FastAPI returns a standard 500 format
+    assert "detail" in data
+    assert "Internal error: Test error" in data["detail"]
+
+
+async def test_500_keeps_cors_headers(client, mock_bk25_core, monkeypatch):
+    """Test a 500 answered to a cross-origin request still carries CORS headers"""
+    monkeypatch.setattr(mock_bk25_core.get_system_status, "side_effect", Exception("Test error"))
+
+    response = await client.get("/api/system/status", headers={"Origin": "http://example.com"})
+    assert response.status_code == 500
+    assert "access-control-allow-origin" in response.headers
+
+
+async def test_503_keeps_cors_headers(client, monkeypatch):
+    """Test a 503 answered to a cross-origin request still carries CORS headers"""
+    monkeypatch.setattr(_BK25_TARGET, None)
+    
+    response = await client.get("/api/personas", headers={"Origin": "http://example.com"})
+    assert response.status_code == 503
+    assert "access-control-allow-origin" in response.headers
+
+
+async def test_unknown_api_path_404_when_not_initialized(client, monkeypatch):
+    """Test unknown API paths answer 404 rather than 503 before BK25 is initialized"""
+    monkeypatch.setattr(_BK25_TARGET, None)
+    
+    response = await client.get("/api/nonexistent")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "API endpoint not found"
+
+
+@pytest.mark.xfail(reason="CORS headers not visible in test environment - works in real app")
+async def test_cors_headers(client, mock_bk25_core):
+    """Test CORS headers are present"""
+    # Test CORS headers on a GET request to an endpoint that should work
+    response = await client.get("/api/personas")
+    assert response.status_code == 200
+    
+    # Check CORS headers
+    assert "access-control-allow-origin" in response.headers
+    assert "access-control-allow-methods" in response.headers
+    assert "access-control-allow-headers" in response.headers
+
+
+async def test_get_settings(client):
+    """Test get settings endpoint"""
+    response = await client.get(SETTINGS_URL)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "provider" in data
+    assert "ollama" in data
+    assert "openai" in data
+    assert "anthropic" in data
+    assert "google" in data
+    assert "custom" in data
+    assert "temperature" in data
+    assert "maxTokens" in data
+    assert "timeout" in data
+    
+    # Check default values
+    assert data["provider"] == "ollama"
+    assert data["ollama"]["url"] == "http://localhost:11434"
+    assert data["ollama"]["model"] == "llama3.1:8b"
+    assert data["temperature"] == 0.7
+    assert data["maxTokens"] == 2000
+    assert data["timeout"] == 60
+
+
+async def test_save_settings_ollama(client):
+    """Test save settings endpoint with Ollama provider"""
+    settings = {
+        "provider": "ollama",
+        "ollama": {
+            "url": "http://localhost:11435",
+            "model": "llama3.2:7b"
+        },
+        "temperature": 0.8,
+        "maxTokens": 1500,
+        "timeout": 90
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["message"] == "Settings saved successfully"
+    assert data["provider"] == "ollama"
+    
+    # Verify settings were saved by getting them again
+    response = await client.get(SETTINGS_URL)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["provider"] == "ollama"
+    assert data["ollama"]["url"] == "http://localhost:11435"
+    assert data["ollama"]["model"] == "llama3.2:7b"
+    assert data["temperature"] == 0.8
+    assert data["maxTokens"] == 1500
+    assert data["timeout"] == 90
+
+
+async def test_save_settings_openai(client):
+    """Test save settings endpoint with OpenAI provider"""
+    settings = {
+        "provider": "openai",
+        "openai": {
+            "apiKey": "sk-test123456789",
+            "model": "gpt-4-turbo",
+            "baseUrl": "https://api.openai.com/v1"
+        },
+        "temperature": 0.5,
+        "maxTokens": 3000
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["message"] == "Settings saved successfully"
+    assert data["provider"] == "openai"
+    
+    # Verify settings were saved
+    response = await client.get(SETTINGS_URL)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["provider"] == "openai"
+    assert data["openai"]["apiKey"] == "sk-test123456789"
+    assert data["openai"]["model"] == "gpt-4-turbo"
+    assert data["temperature"] == 0.5
+    assert data["maxTokens"] == 3000
+
+
+async def test_save_settings_anthropic(client):
+    """Test save settings endpoint with Anthropic provider"""
+    settings = {
+        "provider": "anthropic",
+        "anthropic": {
+            "apiKey": "sk-ant-test123456789",
+            "model": "claude-3-opus",
+            "baseUrl": "https://api.anthropic.com"
         }
-        
-        response = client.post("/api/personas/create", json=incomplete_data)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Missing required field" in data["detail"]
-
-    def test_get_channels(self, client, mock_bk25_core):
-        """Test get channels endpoint"""
-        response = client.get("/api/channels")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "channels" in data
-        assert "current_channel" in data
-        assert "total_count" in data
-        assert len(data["channels"]) == 1
-        assert data["channels"][0]["id"] == "test-channel"
-
-    def test_get_current_channel(self, client, mock_bk25_core):
-        """Test get current channel endpoint"""
-        response = client.get("/api/channels/current")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["id"] == "test-channel"
-        assert data["name"] == "Test Channel"
-        assert "capabilities" in data
-
-    def test_get_channel_by_id(self, client, mock_bk25_core):
-        """Test get channel by ID endpoint"""
-        response = client.get("/api/channels/test-channel")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["id"] == "test-channel"
-        assert data["name"] == "Test Channel"
-
-    def test_switch_channel(self, client, mock_bk25_core):
-        """Test switch channel endpoint"""
-        response = client.post("/api/channels/test-channel/switch")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "message" in data
-        assert "channel" in data
-
-    def test_chat_endpoint(self, client, mock_bk25_core):
-        """Test chat endpoint"""
-        chat_data = {
-            "message": "Hello, how are you?",
-            "conversation_id": "test-conv"
-        }
-        
-        # Mock process_message method
-        mock_bk25_core.process_message = AsyncMock(return_value={
-            "response": "Hello! I'm doing well, thank you.",
-            "persona": {"id": "test-persona"},
-            "channel": {"id": "test-channel"},
-            "conversation_id": "test-conv"
-        })
-        
-        response = client.post("/api/chat", json=chat_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "response" in data
-        assert "persona" in data
-        assert "channel" in data
-
-    def test_chat_endpoint_missing_message(self, client, mock_bk25_core):
-        """Test chat endpoint with missing message"""
-        chat_data = {
-            "conversation_id": "test-conv"
-            # Missing message
-        }
-        
-        response = client.post("/api/chat", json=chat_data)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Message is required" in data["detail"]
-
-    def test_generate_automation(self, client, mock_bk25_core):
-        """Test generate automation endpoint"""
-        generate_data = {
-            "prompt": "Create a backup script",
-            "conversation_id": "test-conv"
-        }
-        
-        # Mock generate_completion method
-        mock_bk25_core.generate_completion = AsyncMock(return_value="Generated script content")
-        
-        response = client.post("/api/generate", json=generate_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "generated_code" in data
-        assert "persona" in data
-
-    def test_generate_automation_missing_prompt(self, client, mock_bk25_core):
-        """Test generate automation endpoint with missing prompt"""
-        generate_data = {
-            "conversation_id": "test-conv"
-            # Missing prompt
-        }
-        
-        response = client.post("/api/generate", json=generate_data)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Prompt is required" in data["detail"]
-
-    def test_get_conversations(self, client, mock_bk25_core):
-        """Test get conversations endpoint"""
-        response = client.get("/api/conversations")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "conversations" in data
-        assert "total_count" in data
-        assert len(data["conversations"]) == 1
-
-    def test_get_conversation_by_id(self, client, mock_bk25_core):
-        """Test get conversation by ID endpoint"""
-        response = client.get("/api/conversations/conv1")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "conversation_id" in data
-        assert "messages" in data
-        assert "total_messages" in data
-
-    def test_get_conversation_with_limit(self, client, mock_bk25_core):
-        """Test get conversation with limit parameter"""
-        response = client.get("/api/conversations/conv1?limit=5")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "conversation_id" in data
-        assert "messages" in data
-
-    def test_get_system_status(self, client, mock_bk25_core):
-        """Test get system status endpoint"""
-        response = client.get("/api/system/status")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "ollama_connected" in data
-        assert "personas_loaded" in data
-        assert "channels_available" in data
-
-    def test_get_memory_info(self, client, mock_bk25_core):
-        """Test get memory info endpoint"""
-        response = client.get("/api/system/memory")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "conversations" in data
-        assert "messages" in data
-
-    def test_generate_script(self, client, mock_bk25_core):
-        """Test generate script endpoint"""
-        script_data = {
-            "description": "Backup script",
-            "platform": "powershell"
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["message"] == "Settings saved successfully"
+    assert data["provider"] == "anthropic"
+
+
+async def test_save_settings_google(client):
+    """Test save settings endpoint with Google provider"""
+    settings = {
+        "provider": "google",
+        "google": {
+            "apiKey": "AIza-test123456789",
+            "model": "gemini-1.5-flash"
         }
-        
-        # Mock generate_script method
-        mock_bk25_core.generate_script = AsyncMock(return_value={
-            "script": "Write-Host 'Backup script'",
-            "platform": "powershell"
-        })
-        
-        response = client.post("/api/generate/script", json=script_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "script" in data
-        assert "platform" in data
-
-    def test_generate_script_missing_description(self, client, mock_bk25_core):
-        """Test generate script endpoint with missing description"""
-        script_data = {
-            "platform": "powershell"
-            # Missing description
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["message"] == "Settings saved successfully"
+    assert data["provider"] == "google"
+
+
+async def test_save_settings_custom(client):
+    """Test save settings endpoint with Custom provider"""
+    settings = {
+        "provider": "custom",
+        "custom": {
+            "url": "https://api.custom-llm.com/v1",
+            "apiKey": "custom-test-key",
+            "model": "custom-model"
         }
-        
-        response = client.post("/api/generate/script", json=script_data)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Description is required" in data["detail"]
-
-    def test_get_supported_platforms(self, client, mock_bk25_core):
-        """Test get supported platforms endpoint"""
-        response = client.get("/api/generate/platforms")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "platforms" in data
-        assert "powershell" in data["platforms"]
-
-    def test_get_platform_info(self, client, mock_bk25_core):
-        """Test get platform info endpoint"""
-        response = client.get("/api/generate/platform/powershell")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "name" in data
-        assert "description" in data
-
-    def test_get_platform_info_not_found(self, client, mock_bk25_core):
-        """Test get platform info endpoint for non-existent platform"""
-        # Mock to return None for non-existent platform
-        mock_bk25_core.get_platform_info.return_value = None
-        
-        response = client.get("/api/generate/platform/nonexistent")
-        assert response.status_code == 404
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Platform nonexistent not found" in data["detail"]
-
-    def test_get_automation_suggestions(self, client, mock_bk25_core):
-        """Test get automation suggestions endpoint"""
-        suggestion_data = {
-            "description": "File management"
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["message"] == "Settings saved successfully"
+    assert data["provider"] == "custom"
+
+
+async def test_save_settings_missing_provider(client):
+    """Test save settings endpoint with missing provider"""
+    settings = {
+        "temperature": 0.5
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Provider is required" in data["detail"]
+
+
+async def test_save_settings_ollama_missing_url(client):
+    """Test save settings endpoint with Ollama provider missing URL"""
+    settings = {
+        "provider": "ollama",
+        "ollama": {
+            "model": "llama3.1:8b"
         }
-        
-        response = client.post("/api/generate/suggestions", json=suggestion_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "suggestions" in data
-        assert len(data["suggestions"]) >= 1
-
-    def test_get_automation_suggestions_missing_description(self, client, mock_bk25_core):
-        """Test get automation suggestions endpoint with missing description"""
-        suggestion_data = {}
-        # Missing description
-        
-        response = client.post("/api/generate/suggestions", json=suggestion_data)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Description is required" in data["detail"]
-
-    def test_get_llm_status(self, client, mock_bk25_core):
-        """Test get LLM status endpoint"""
-        response = client.get("/api/llm/status")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "providers" in data
-        assert "current_provider" in data
-
-    def test_get_llm_provider_info(self, client, mock_bk25_core):
-        """Test get LLM provider info endpoint"""
-        response = client.get("/api/llm/providers/ollama")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "name" in data
-        assert "status" in data
-
-    def test_get_llm_provider_info_not_found(self, client, mock_bk25_core):
-        """Test get LLM provider info endpoint for non-existent provider"""
-        # Mock to return None for non-existent provider
-        mock_bk25_core.get_llm_provider_info.return_value = None
-        
-        response = client.get("/api/llm/providers/nonexistent")
-        assert response.status_code == 404
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Provider nonexistent not found" in data["detail"]
-
-    def test_test_llm_generation(self, client, mock_bk25_core):
-        """Test test LLM generation endpoint"""
-        test_data = {
-            "prompt": "Hello, how are you?",
-            "provider": "ollama"
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Ollama URL is required" in data["detail"]
+
+
+async def test_save_settings_ollama_missing_model(client):
+    """Test save settings endpoint with Ollama provider missing model"""
+    settings = {
+        "provider": "ollama",
+        "ollama": {
+            "url": "http://localhost:11434"
         }
-        
-        # Mock test_llm_generation method
-        mock_bk25_core.test_llm_generation = AsyncMock(return_value={
-            "success": True,
-            "response": "Hello! I'm doing well, thank you for asking."
-        })
-        
-        response = client.post("/api/llm/test", json=test_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "success" in data
-        assert "response" in data
-
-    def test_test_llm_generation_missing_prompt(self, client, mock_bk25_core):
-        """Test test LLM generation endpoint with missing prompt"""
-        test_data = {
-            "provider": "ollama"
-            # Missing prompt
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Ollama model is required" in data["detail"]
+
+
+async def test_save_settings_openai_missing_api_key(client):
+    """Test save settings endpoint with OpenAI provider missing API key"""
+    settings = {
+        "provider": "openai",
+        "openai": {
+            "model": "gpt-4"
         }
-        
-        response = client.post("/api/llm/test", json=test_data)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Prompt is required" in data["detail"]
-
-    def test_improve_script(self, client, mock_bk25_core):
-        """Test improve script endpoint"""
-        improve_data = {
-            "script": "Write-Host 'Hello'",
-            "feedback": "Add error handling",
-            "platform": "powershell"
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "OpenAI API key is required" in data["detail"]
+
+
+async def test_save_settings_openai_missing_model(client):
+    """Test save settings endpoint with OpenAI provider missing model"""
+    settings = {
+        "provider": "openai",
+        "openai": {
+            "apiKey": "sk-test123"
         }
-        
-        response = client.post("/api/scripts/improve", json=improve_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "improved_script" in data
-        assert "changes" in data
-
-    def test_improve_script_missing_fields(self, client, mock_bk25_core):
-        """Test improve script endpoint with missing fields"""
-        improve_data = {
-            "script": "Write-Host 'Hello'"
-            # Missing feedback and platform
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "OpenAI model is required" in data["detail"]
+
+
+async def test_save_settings_anthropic_missing_api_key(client):
+    """Test save settings endpoint with Anthropic provider missing API key"""
+    settings = {
+        "provider": "anthropic",
+        "anthropic": {
+            "model": "claude-3-sonnet"
         }
-        
-        response = client.post("/api/scripts/improve", json=improve_data)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Script, feedback, and platform are required" in data["detail"]
-
-    def test_validate_script(self, client, mock_bk25_core):
-        """Test validate script endpoint"""
-        validate_data = {
-            "script": "Write-Host 'Hello'",
-            "platform": "powershell"
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Anthropic API key is required" in data["detail"]
+
+
+async def test_save_settings_google_missing_api_key(client):
+    """Test save settings endpoint with Google provider missing API key"""
+    settings = {
+        "provider": "google",
+        "google": {
+            "model": "gemini-1.5-pro"
         }
-        
-        response = client.post("/api/scripts/validate", json=validate_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "valid" in data
-        assert "suggestions" in data
-
-    def test_validate_script_missing_fields(self, client, mock_bk25_core):
-        """Test validate script endpoint with missing fields"""
-        validate_data = {
-            "script": "Write-Host 'Hello'"
-            # Missing platform
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Google API key is required" in data["detail"]
+
+
+async def test_save_settings_custom_missing_url(client):
+    """Test save settings endpoint with Custom provider missing URL"""
+    settings = {
+        "provider": "custom",
+        "custom": {
+            "apiKey": "custom-key"
         }
-        
-        response = client.post("/api/scripts/validate", json=validate_data)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Script and platform are required" in data["detail"]
-
-    def test_execute_script(self, client, mock_bk25_core):
-        """Test execute script endpoint"""
-        execute_data = {
-            "script": "echo 'Hello World'",
-            "platform": "bash"
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Custom API URL is required" in data["detail"]
+
+
+async def test_save_settings_custom_missing_api_key(client):
+    """Test save settings endpoint with Custom provider missing API key"""
+    settings = {
+        "provider": "custom",
+        "custom": {
+            "url": "https://api.custom.com"
         }
-        
-        response = client.post("/api/execute/script", json=execute_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "success" in data
-        assert "output" in data
-
-    def test_execute_script_missing_fields(self, client, mock_bk25_core):
-        """Test execute script endpoint with missing fields"""
-        execute_data = {
-            "script": "echo 'Hello World'"
-            # Missing platform
-        }
-        
-        response = client.post("/api/execute/script", json=execute_data)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Script and platform are required" in data["detail"]
-
-    def test_submit_execution_task(self, client, mock_bk25_core):
-        """Test submit execution task endpoint"""
-        task_data = {
-            "name": "Test Task",
-            "description": "A test execution task",
-            "script": "echo 'Hello World'",
-            "platform": "bash"
-        }
-        
-        response = client.post("/api/execute/task", json=task_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "task_id" in data
-        assert "status" in data
-
-    def test_submit_execution_task_missing_fields(self, client, mock_bk25_core):
-        """Test submit execution task endpoint with missing fields"""
-        task_data = {
-            "name": "Test Task"
-            # Missing description, script, and platform
-        }
-        
-        response = client.post("/api/execute/task", json=task_data)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Name, description, script, and platform are required" in data["detail"]
-
-    def test_get_task_status(self, client, mock_bk25_core):
-        """Test get task status endpoint"""
-        response = client.get("/api/execute/task/task-123")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "id" in data
-        assert "status" in data
-
-    def test_cancel_execution_task(self, client, mock_bk25_core):
-        """Test cancel execution task endpoint"""
-        response = client.delete("/api/execute/task/task-123")
+    }
+    
+    response = await client.post(SETTINGS_URL, json=settings)
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Custom API key is required" in data["detail"]
+
+
+async def test_test_connection_endpoint(client):
+    """Test test connection endpoint"""
+    # Probe Ollama (default provider) and OpenAI concurrently; the probes are independent
+    responses = await asyncio.gather(
+        client.post(SETTINGS_TEST_URL, json={"provider": "ollama"}),
+        client.post(SETTINGS_TEST_URL, json={"provider": "openai"})
+    )
+    
+    for response in responses:
         assert response.status_code == 200
         
         data = response.json()
         assert "success" in data
         assert "message" in data
 
-    def test_get_execution_history(self, client, mock_bk25_core):
-        """Test get execution history endpoint"""
-        response = client.get("/api/execute/history")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert isinstance(data, list)
-        assert len(data) >= 1
-
-    def test_get_execution_history_with_filters(self, client, mock_bk25_core):
-        """Test get execution history endpoint with filters"""
-        response = client.get("/api/execute/history?limit=10&status=completed&platform=bash")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert isinstance(data, list)
-
-    def test_get_execution_statistics(self, client, mock_bk25_core):
-        """Test get execution statistics endpoint"""
-        response = client.get("/api/execute/statistics")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "total_tasks" in data
-        assert "completed_tasks" in data
-
-    @pytest.mark.xfail(reason="Mock setup issue with execution monitor - needs investigation")
-    def test_get_running_tasks(self, client, mock_bk25_core):
-        """Test get running tasks endpoint"""
-        response = client.get("/api/execute/running")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "success" in data
-        assert "running_tasks" in data
-        assert "total_count" in data
-
-    def test_404_handler(self, client):
-        """Test 404 error handler"""
-        response = client.get("/api/nonexistent")
-        assert response.status_code == 404
-        
-        data = response.json()
-        # FastAPI returns a standard 404 format
-        assert "detail" in data
-        assert "API endpoint not found" in data["detail"]
-
-    def test_500_handler(self, client, mock_bk25_core):
-        """Test 500 error handler"""
-        # Mock a method to raise an exception
-        mock_bk25_core.get_system_status.side_effect = Exception("Test error")
 
-        response = client.get("/api/system/status")
-        assert response.status_code == 500
-
-        data = response.json()
-        # FastAPI returns a standard 500 format
-        assert "detail" in data
-        assert "Error getting system status: Test error" in data["detail"]
-
-    @pytest.mark.xfail(reason="CORS headers not visible in test environment - works in real app")
-    def test_cors_headers(self, client, mock_bk25_core):
-        """Test CORS headers are present"""
-        # Test CORS headers on a GET request to an endpoint that should work
-        response = client.get("/api/personas")
-        assert response.status_code == 200
-        
-        # Check CORS headers
-        assert "access-control-allow-origin" in response.headers
-        assert "access-control-allow-methods" in response.headers
-        assert "access-control-allow-headers" in response.headers
-
-    def test_get_settings(self, client):
-        """Test get settings endpoint"""
-        response = client.get("/api/settings")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "provider" in data
-        assert "ollama" in data
-        assert "openai" in data
-        assert "anthropic" in data
-        assert "google" in data
-        assert "custom" in data
-        assert "temperature" in data
-        assert "maxTokens" in data
-        assert "timeout" in data
-        
-        # Check default values
-        assert data["provider"] == "ollama"
-        assert data["ollama"]["url"] == "http://localhost:11434"
-        assert data["ollama"]["model"] == "llama3.1:8b"
-        assert data["temperature"] == 0.7
-        assert data["maxTokens"] == 2000
-        assert data["timeout"] == 60
-
-    def test_save_settings_ollama(self, client):
-        """Test save settings endpoint with Ollama provider"""
-        settings = {
-            "provider": "ollama",
-            "ollama": {
-                "url": "http://localhost:11435",
-                "model": "llama3.2:7b"
-            },
-            "temperature": 0.8,
-            "maxTokens": 1500,
-            "timeout": 90
+async def test_test_connection_invalid_provider(client):
+    """Test test connection endpoint with invalid provider"""
+    response = await client.post(SETTINGS_TEST_URL, json={"provider": "invalid"})
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Unsupported provider" in data["detail"]
+
+
+async def test_test_connection_missing_provider(client):
+    """Test test connection endpoint with missing provider"""
+    response = await client.post(SETTINGS_TEST_URL, json={})
+    assert response.status_code == 400
+    
+    data = response.json()
+    assert "detail" in data
+    assert "Provider is required" in data["detail"]
+
+
+async def test_settings_persistence(client):
+    """Test that settings are persisted across requests"""
+    # Set initial settings
+    initial_settings = {
+        "provider": "openai",
+        "openai": {
+            "apiKey": "sk-persist-test",
+            "model": "gpt-4"
         }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["message"] == "Settings saved successfully"
-        assert data["provider"] == "ollama"
-        
-        # Verify settings were saved by getting them again
-        response = client.get("/api/settings")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["provider"] == "ollama"
-        assert data["ollama"]["url"] == "http://localhost:11435"
-        assert data["ollama"]["model"] == "llama3.2:7b"
-        assert data["temperature"] == 0.8
-        assert data["maxTokens"] == 1500
-        assert data["timeout"] == 90
-
-    def test_save_settings_openai(self, client):
-        """Test save settings endpoint with OpenAI provider"""
-        settings = {
-            "provider": "openai",
-            "openai": {
-                "apiKey": "sk-test123456789",
-                "model": "gpt-4-turbo",
-                "baseUrl": "https://api.openai.com/v1"
-            },
-            "temperature": 0.5,
-            "maxTokens": 3000
+    }
+    
+    response = await client.post(SETTINGS_URL, json=initial_settings)
+    assert response.status_code == 200
+    
+    # Get settings to verify they were saved
+    response = await client.get(SETTINGS_URL)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["provider"] == "openai"
+    assert data["openai"]["apiKey"] == "sk-persist-test"
+    
+    # Update settings
+    updated_settings = {
+        "provider": "anthropic",
+        "anthropic": {
+            "apiKey": "sk-ant-persist-test",
+            "model": "claude-3-sonnet"
         }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["message"] == "Settings saved successfully"
-        assert data["provider"] == "openai"
-        
-        # Verify settings were saved
-        response = client.get("/api/settings")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["provider"] == "openai"
-        assert data["openai"]["apiKey"] == "sk-test123456789"
-        assert data["openai"]["model"] == "gpt-4-turbo"
-        assert data["temperature"] == 0.5
-        assert data["maxTokens"] == 3000
-
-    def test_save_settings_anthropic(self, client):
-        """Test save settings endpoint with Anthropic provider"""
-        settings = {
-            "provider": "anthropic",
-            "anthropic": {
-                "apiKey": "sk-ant-test123456789",
-                "model": "claude-3-opus",
-                "baseUrl": "https://api.anthropic.com"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["message"] == "Settings saved successfully"
-        assert data["provider"] == "anthropic"
-
-    def test_save_settings_google(self, client):
-        """Test save settings endpoint with Google provider"""
-        settings = {
-            "provider": "google",
-            "google": {
-                "apiKey": "AIza-test123456789",
-                "model": "gemini-1.5-flash"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["message"] == "Settings saved successfully"
-        assert data["provider"] == "google"
-
-    def test_save_settings_custom(self, client):
-        """Test save settings endpoint with Custom provider"""
-        settings = {
-            "provider": "custom",
-            "custom": {
-                "url": "https://api.custom-llm.com/v1",
-                "apiKey": "custom-test-key",
-                "model": "custom-model"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["message"] == "Settings saved successfully"
-        assert data["provider"] == "custom"
-
-    def test_save_settings_missing_provider(self, client):
-        """Test save settings endpoint with missing provider"""
-        settings = {
-            "temperature": 0.5
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Provider is required" in data["detail"]
-
-    def test_save_settings_ollama_missing_url(self, client):
-        """Test save settings endpoint with Ollama provider missing URL"""
-        settings = {
-            "provider": "ollama",
-            "ollama": {
-                "model": "llama3.1:8b"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Ollama URL is required" in data["detail"]
-
-    def test_save_settings_ollama_missing_model(self, client):
-        """Test save settings endpoint with Ollama provider missing model"""
-        settings = {
-            "provider": "ollama",
-            "ollama": {
-                "url": "http://localhost:11434"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Ollama model is required" in data["detail"]
-
-    def test_save_settings_openai_missing_api_key(self, client):
-        """Test save settings endpoint with OpenAI provider missing API key"""
-        settings = {
-            "provider": "openai",
-            "openai": {
-                "model": "gpt-4"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "OpenAI API key is required" in data["detail"]
-
-    def test_save_settings_openai_missing_model(self, client):
-        """Test save settings endpoint with OpenAI provider missing model"""
-        settings = {
-            "provider": "openai",
-            "openai": {
-                "apiKey": "sk-test123"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "OpenAI model is required" in data["detail"]
-
-    def test_save_settings_anthropic_missing_api_key(self, client):
-        """Test save settings endpoint with Anthropic provider missing API key"""
-        settings = {
-            "provider": "anthropic",
-            "anthropic": {
-                "model": "claude-3-sonnet"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Anthropic API key is required" in data["detail"]
-
-    def test_save_settings_google_missing_api_key(self, client):
-        """Test save settings endpoint with Google provider missing API key"""
-        settings = {
-            "provider": "google",
-            "google": {
-                "model": "gemini-1.5-pro"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Google API key is required" in data["detail"]
-
-    def test_save_settings_custom_missing_url(self, client):
-        """Test save settings endpoint with Custom provider missing URL"""
-        settings = {
-            "provider": "custom",
-            "custom": {
-                "apiKey": "custom-key"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Custom API URL is required" in data["detail"]
-
-    def test_save_settings_custom_missing_api_key(self, client):
-        """Test save settings endpoint with Custom provider missing API key"""
-        settings = {
-            "provider": "custom",
-            "custom": {
-                "url": "https://api.custom.com"
-            }
-        }
-        
-        response = client.post("/api/settings", json=settings)
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Custom API key is required" in data["detail"]
-
-    def test_test_connection_endpoint(self, client):
-        """Test test connection endpoint"""
-        # Test with Ollama (default provider)
-        response = client.post("/api/settings/test", json={"provider": "ollama"})
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "success" in data
-        assert "message" in data
-        
-        # Test with OpenAI
-        response = client.post("/api/settings/test", json={"provider": "openai"})
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "success" in data
-        assert "message" in data
-
-    def test_test_connection_invalid_provider(self, client):
-        """Test test connection endpoint with invalid provider"""
-        response = client.post("/api/settings/test", json={"provider": "invalid"})
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Unsupported provider" in data["detail"]
-
-    def test_test_connection_missing_provider(self, client):
-        """Test test connection endpoint with missing provider"""
-        response = client.post("/api/settings/test", json={})
-        assert response.status_code == 400
-        
-        data = response.json()
-        assert "detail" in data
-        assert "Provider is required" in data["detail"]
-
-    def test_settings_persistence(self, client):
-        """Test that settings are persisted across requests"""
-        # Set initial settings
-        initial_settings = {
-            "provider": "openai",
-            "openai": {
-                "apiKey": "sk-persist-test",
-                "model": "gpt-4"
-            }
-        }
-        
-        response = client.post("/api/settings", json=initial_settings)
-        assert response.status_code == 200
-        
-        # Get settings to verify they were saved
-        response = client.get("/api/settings")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["provider"] == "openai"
-        assert data["openai"]["apiKey"] == "sk-persist-test"
-        
-        # Update settings
-        updated_settings = {
-            "provider": "anthropic",
-            "anthropic": {
-                "apiKey": "sk-ant-persist-test",
-                "model": "claude-3-sonnet"
-            }
-        }
-        
-        response = client.post("/api/settings", json=updated_settings)
-        assert response.status_code == 200
-        
-        # Get settings again to verify they were updated
-        response = client.get("/api/settings")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["provider"] == "anthropic"
-        assert data["anthropic"]["apiKey"] == "sk-ant-persist-test"
-
-    def test_api_documentation(self, client):
-        """Test API documentation endpoints"""
-        # Test OpenAPI schema
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "openapi" in data
-        assert "paths" in data
-        
-        # Test Swagger UI
-        response = client.get("/docs")
-        assert response.status_code == 200
-        
-        # Test ReDoc
-        response = client.get("/redoc")
-        assert response.status_code == 200
+    }
+    
+    response = await client.post(SETTINGS_URL, json=updated_settings)
+    assert response.status_code == 200
+    
+    # Get settings again to verify they were updated
+    response = await client.get(SETTINGS_URL)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["provider"] == "anthropic"
+    assert data["anthropic"]["apiKey"] == "sk-ant-persist-test"
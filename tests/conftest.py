@@ -3,10 +3,10 @@ Pytest configuration and shared fixtures for BK25 tests
 """
 
 import pytest
-import asyncio
+import json
 import tempfile
-import shutil
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 from typing import Dict, Any, Generator
 from unittest.mock import Mock, AsyncMock
 
@@ -24,29 +24,70 @@ from src.core.llm_integration import LLMManager
 from src.core.prompt_engineering import PromptEngineer
 from src.core.script_executor import ScriptExecutor
 from src.core.execution_monitor import ExecutionMonitor
-from src.config import config
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session"""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def _frozen(value):
+    """Recursively freeze payload data shared across tests"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _frozen(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_frozen(item) for item in value)
+    return value
+
+
+def _returning(value):
+    """Build a coroutine stub for mocked async methods whose calls are never inspected"""
+    async def stub(*args, **kwargs):
+        return value
+    return stub
+
+
+# Sample persona and channel shared by the payload fixtures and test_data_dir
+_TEST_PERSONA = {
+    "id": "test-persona",
+    "name": "Test Persona",
+    "description": "A test persona for unit testing",
+    "greeting": "Hello! I'm a test persona.",
+    "capabilities": ["testing", "debugging"],
+    "personality": {
+        "tone": "professional",
+        "approach": "systematic",
+        "philosophy": "testing",
+        "motto": "Test everything"
+    },
+    "examples": ["Test example 1", "Test example 2"],
+    "channels": ["web", "cli"],
+    "system_prompt": "You are a test persona focused on testing and debugging."
+}
+
+_TEST_CHANNEL = {
+    "id": "test-channel",
+    "name": "Test Channel",
+    "description": "A test channel for unit testing",
+    "capabilities": {
+        "text": {"supported": True, "description": "Text messaging"},
+        "files": {"supported": False, "description": "File sharing"}
+    },
+    "artifact_types": ["text", "json"],
+    "metadata": {"test": True}
+}
+
+# Serialized once for the files test_data_dir writes
+_TEST_PERSONA_BYTES = json.dumps(_TEST_PERSONA, indent=2).encode()
+_TEST_CHANNEL_BYTES = json.dumps(_TEST_CHANNEL, indent=2).encode()
 
 
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test files"""
-    temp_dir = tempfile.mkdtemp()
-    yield Path(temp_dir)
-    shutil.rmtree(temp_dir)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_config():
     """Mock configuration for testing"""
-    return {
+    return _frozen({
         "ollama_url": "http://localhost:11434",
         "model": "llama3.1:8b",
         "personas_path": "./personas",
@@ -54,13 +95,13 @@ def mock_config():
         "max_messages_per_conversation": 25,
         "execution_timeout": 300,
         "log_level": "DEBUG"
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_llm_response():
     """Mock LLM response for testing"""
-    return {
+    return _frozen({
         "success": True,
         "content": "This is a test response from the LLM",
         "error": None,
@@ -73,50 +114,25 @@ def mock_llm_response():
             "provider": "ollama",
             "model": "llama3.1:8b"
         }
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_persona_data():
     """Mock persona data for testing"""
-    return {
-        "id": "test-persona",
-        "name": "Test Persona",
-        "description": "A test persona for unit testing",
-        "greeting": "Hello! I'm a test persona.",
-        "capabilities": ["testing", "debugging"],
-        "personality": {
-            "tone": "professional",
-            "approach": "systematic",
-            "philosophy": "testing",
-            "motto": "Test everything"
-        },
-        "examples": ["Test example 1", "Test example 2"],
-        "channels": ["web", "cli"],
-        "system_prompt": "You are a test persona focused on testing and debugging."
-    }
+    return _frozen(_TEST_PERSONA)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_channel_data():
     """Mock channel data for testing"""
-    return {
-        "id": "test-channel",
-        "name": "Test Channel",
-        "description": "A test channel for unit testing",
-        "capabilities": {
-            "text": {"supported": True, "description": "Text messaging"},
-            "files": {"supported": False, "description": "File sharing"}
-        },
-        "artifact_types": ["text", "json"],
-        "metadata": {"test": True}
-    }
+    return _frozen(_TEST_CHANNEL)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_conversation_data():
     """Mock conversation data for testing"""
-    return {
+    return _frozen({
         "id": "test-conversation",
         "persona_id": "test-persona",
         "channel_id": "test-channel",
@@ -124,25 +140,25 @@ def mock_conversation_data():
             {"role": "user", "content": "Hello", "timestamp": "2025-01-27T10:00:00Z"},
             {"role": "assistant", "content": "Hi there!", "timestamp": "2025-01-27T10:00:01Z"}
         ]
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_script_data():
     """Mock script data for testing"""
-    return {
+    return _frozen({
         "description": "Test script for unit testing",
         "platform": "powershell",
         "script": "Write-Host 'Hello from test script'",
         "filename": "test_script.ps1",
         "documentation": "This is a test script"
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_execution_request():
     """Mock execution request for testing"""
-    return {
+    return _frozen({
         "script": "echo 'Hello World'",
         "platform": "bash",
         "filename": "test.sh",
@@ -150,13 +166,13 @@ def mock_execution_request():
         "timeout": 60,
         "policy": "safe",
         "environment": {"TEST": "true"}
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_task_data():
     """Mock task data for testing"""
-    return {
+    return _frozen({
         "id": "test-task-123",
         "name": "Test Task",
         "description": "A test execution task",
@@ -165,35 +181,35 @@ def mock_task_data():
         "priority": "normal",
         "tags": ["test", "unit"],
         "metadata": {"test": True}
-    }
+    })
 
 
 @pytest.fixture
-async def mock_bk25_core(mock_config):
+def mock_bk25_core(mock_config):
     """Create a mock BK25 core instance for testing"""
     core = BK25Core(mock_config)
     
     # Mock external dependencies
     core.ollama_connected = False
-    core.llm_manager.test_providers = AsyncMock(return_value={"ollama": False})
-    core.llm_manager.get_available_providers = Mock(return_value=["ollama"])
+    core.llm_manager.test_providers = _returning({"ollama": False})
+    core.llm_manager.get_available_providers = lambda: ["ollama"]
     
     # Mock persona manager
-    core.persona_manager.get_all_personas = Mock(return_value=[])
-    core.persona_manager.get_current_persona = Mock(return_value=None)
+    core.persona_manager.get_all_personas = lambda: []
+    core.persona_manager.get_current_persona = lambda: None
     
     # Mock channel manager
-    core.channel_manager.get_all_channels = Mock(return_value=[])
-    core.channel_manager.get_current_channel = Mock(return_value=None)
+    core.channel_manager.get_all_channels = lambda: []
+    core.channel_manager.get_current_channel = lambda: None
     
     # Mock code generator
-    core.code_generator.get_supported_platforms = Mock(return_value=["powershell", "bash", "applescript"])
+    core.code_generator.get_supported_platforms = lambda: ["powershell", "bash", "applescript"]
     
     # Mock execution monitor
-    core.execution_monitor.start_monitoring = AsyncMock()
-    core.execution_monitor.get_system_statistics = AsyncMock(return_value={})
+    core.execution_monitor.start_monitoring = _returning(None)
+    core.execution_monitor.get_system_statistics = _returning({})
     
-    yield core
+    return core
 
 
 @pytest.fixture
@@ -248,7 +264,7 @@ def mock_code_generator():
 def mock_llm_manager(mock_config):
     """Create a mock LLM manager for testing"""
     lm = LLMManager(mock_config)
-    lm.test_providers = AsyncMock(return_value={"ollama": False})
+    lm.test_providers = _returning({"ollama": False})
     lm.get_available_providers = Mock(return_value=["ollama"])
     lm.get_provider_info = Mock(return_value={})
     lm.generate = AsyncMock(return_value=Mock(success=True, content="Test response"))
@@ -287,81 +303,59 @@ def mock_script_executor(mock_config):
     return se
 
 
+# Task returned by the mock execution monitor; built once since no test mutates it
+_TASK_STATUS_TEMPLATE = SimpleNamespace(
+    id="test-task-123",
+    name="Test Task",
+    description="Test description",
+    status=SimpleNamespace(value="completed"),
+    priority=SimpleNamespace(value="normal"),
+    created_at=None,
+    started_at=None,
+    completed_at=None,
+    created_at_iso=None,
+    started_at_iso=None,
+    completed_at_iso=None,
+    execution_time=1.0,
+    exit_code=0,
+    output="Test output",
+    error=None,
+    tags=["test"],
+    metadata={"test": True}
+)
+
+
 @pytest.fixture
 def mock_execution_monitor(mock_config):
     """Create a mock execution monitor for testing"""
     em = ExecutionMonitor(mock_config)
-    em.start_monitoring = AsyncMock()
-    em.shutdown = AsyncMock()
-    em.submit_task = AsyncMock(return_value="test-task-123")
-    em.get_task_status = AsyncMock(return_value=Mock(
-        id="test-task-123",
-        name="Test Task",
-        description="Test description",
-        status=Mock(value="completed"),
-        priority=Mock(value="normal"),
-        created_at=None,
-        started_at=None,
-        completed_at=None,
-        execution_time=1.0,
-        exit_code=0,
-        output="Test output",
-        error=None,
-        tags=["test"],
-        metadata={"test": True}
-    ))
-    em.get_execution_history = AsyncMock(return_value=[])
-    em.get_system_statistics = AsyncMock(return_value={})
-    em.get_running_tasks = AsyncMock(return_value=[])
-    em.cancel_task = AsyncMock(return_value=True)
+    em.start_monitoring = _returning(None)
+    em.shutdown = _returning(None)
+    em.submit_task = _returning("test-task-123")
+    em.get_task_status = _returning(_TASK_STATUS_TEMPLATE)
+    em.get_execution_history = _returning([])
+    em.get_system_statistics = _returning({})
+    em.get_running_tasks = _returning([])
+    em.cancel_task = _returning(True)
     return em
 
 
-@pytest.fixture
-def test_data_dir(temp_dir):
+@pytest.fixture(scope="session")
+def test_data_dir(tmp_path_factory):
     """Create test data directory with sample files"""
-    # Create personas directory
-    personas_dir = temp_dir / "personas"
-    personas_dir.mkdir()
+    data_dir = tmp_path_factory.mktemp("test_data")
     
     # Create sample persona file
-    persona_file = personas_dir / "test-persona.json"
-    persona_file.write_text('''{
-        "id": "test-persona",
-        "name": "Test Persona",
-        "description": "A test persona for unit testing",
-        "greeting": "Hello! I'm a test persona.",
-        "capabilities": ["testing", "debugging"],
-        "personality": {
-            "tone": "professional",
-            "approach": "systematic",
-            "philosophy": "testing",
-            "motto": "Test everything"
-        },
-        "examples": ["Test example 1", "Test example 2"],
-        "channels": ["web", "cli"],
-        "system_prompt": "You are a test persona focused on testing and debugging."
-    }''')
-    
-    # Create channels directory
-    channels_dir = temp_dir / "channels"
-    channels_dir.mkdir()
+    personas_dir = data_dir / "personas"
+    personas_dir.mkdir()
+    (personas_dir / "test-persona.json").write_bytes(_TEST_PERSONA_BYTES)
     
     # Create sample channel file
-    channel_file = channels_dir / "test-channel.json"
-    channel_file.write_text('''{
-        "id": "test-channel",
-        "name": "Test Channel",
-        "description": "A test channel for unit testing",
-        "capabilities": {
-            "text": {"supported": true, "description": "Text messaging"},
-            "files": {"supported": false, "description": "File sharing"}
-        },
-        "artifact_types": ["text", "json"],
-        "metadata": {"test": true}
-    }''')
+    channels_dir = data_dir / "channels"
+    channels_dir.mkdir()
+    (channels_dir / "test-channel.json").write_bytes(_TEST_CHANNEL_BYTES)
     
-    yield temp_dir
+    return data_dir
 
 
 @pytest.fixture
@@ -416,3 +410,6 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "web: Web interface tests"
     )
+    config.addinivalue_line(
+        "markers", "creates_directories: Tests that let BK25Config create its directories"
+    )
@@ -15,26 +15,40 @@ from src.main import app
 from src.config import BK25Config, config
 
 
+def _clear_environ(monkeypatch):
+    """Remove every environment variable for the rest of the test"""
+    for key in list(os.environ):
+        monkeypatch.delenv(key)
+
+
+@pytest.fixture(autouse=True)
+def _skip_directory_creation(request, monkeypatch):
+    """Keep BK25Config off the disk unless the test checks directory creation"""
+    if "creates_directories" not in request.keywords:
+        monkeypatch.setattr(BK25Config, "_create_directories", lambda self: None)
+
+
 class TestConfigurationIntegration:
     """Test configuration system integration"""
     
-    def test_config_initialization(self):
+    def test_config_initialization(self, monkeypatch):
         """Test that configuration is properly initialized on app startup"""
         # Create a fresh config instance to avoid interference from other tests
-        with patch.dict(os.environ, {}, clear=True):
-            test_config = BK25Config()
-            
-            # Check that config is properly initialized
-            assert test_config is not None
-            assert hasattr(test_config, 'llm')
-            assert hasattr(test_config, 'server')
-            assert hasattr(test_config, 'paths')
-            
-            # Check default values
-            assert test_config.llm.provider == "ollama"
-            assert test_config.server.port == 3003
-            assert test_config.server.reload is True
+        _clear_environ(monkeypatch)
+        test_config = BK25Config()
+        
+        # Check that config is properly initialized
+        assert test_config is not None
+        assert hasattr(test_config, 'llm')
+        assert hasattr(test_config, 'server')
+        assert hasattr(test_config, 'paths')
+        
+        # Check default values
+        assert test_config.llm.provider == "ollama"
+        assert test_config.server.port == 3003
+        assert test_config.server.reload is True
     
+    @pytest.mark.creates_directories
     def test_config_directory_creation(self):
         """Test that configuration creates necessary directories"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -54,14 +68,13 @@ class TestConfigurationIntegration:
             # Create directories
             test_config._create_directories()
             
-            # Check directories were created
-            assert (Path(temp_dir) / "data").exists()
-            assert (Path(temp_dir) / "data" / "personas").exists()
-            assert (Path(temp_dir) / "data" / "channels").exists()
-            assert (Path(temp_dir) / "logs").exists()
-            assert (Path(temp_dir) / "config").exists()
+            # Check directories were created, reading each parent once
+            top_level = {entry.name for entry in os.scandir(temp_dir)}
+            assert {"data", "logs", "config"} <= top_level
+            data_level = {entry.name for entry in os.scandir(Path(temp_dir) / "data")}
+            assert {"personas", "channels"} <= data_level
     
-    def test_config_file_loading(self):
+    def test_config_file_loading(self, tmp_path):
         """Test configuration loading from JSON file"""
         config_data = {
             'llm': {
@@ -75,23 +88,19 @@ class TestConfigurationIntegration:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(config_data, f)
-            config_file = f.name
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps(config_data))
         
-        try:
-            test_config = BK25Config(config_file)
-            
-            # Check that file config was loaded
-            assert test_config.llm.provider == 'openai'
-            assert test_config.llm.openai_api_key == 'file-key'
-            assert test_config.llm.openai_model == 'gpt-4'
-            assert test_config.server.port == 9000
-            assert test_config.server.host == '127.0.0.1'
-        finally:
-            os.unlink(config_file)
+        test_config = BK25Config(str(config_file))
+        
+        # Check that file config was loaded
+        assert test_config.llm.provider == 'openai'
+        assert test_config.llm.openai_api_key == 'file-key'
+        assert test_config.llm.openai_model == 'gpt-4'
+        assert test_config.server.port == 9000
+        assert test_config.server.host == '127.0.0.1'
     
-    def test_environment_override_file(self):
+    def test_environment_override_file(self, tmp_path, monkeypatch):
         """Test that environment variables override file configuration"""
         config_data = {
             'llm': {
@@ -100,23 +109,17 @@ class TestConfigurationIntegration:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(config_data, f)
-            config_file = f.name
-        
-        try:
-            with patch.dict(os.environ, {
-                'LLM_PROVIDER': 'openai',
-                'OLLAMA_MODEL': 'env-model'
-            }):
-                test_config = BK25Config(config_file)
-                
-                # Environment should override file
-                assert test_config.llm.provider == 'openai'
-                # Environment should also override ollama_model since OLLAMA_MODEL was set
-                assert test_config.llm.ollama_model == 'env-model'
-        finally:
-            os.unlink(config_file)
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps(config_data))
+        
+        monkeypatch.setenv('LLM_PROVIDER', 'openai')
+        monkeypatch.setenv('OLLAMA_MODEL', 'env-model')
+        test_config = BK25Config(str(config_file))
+        
+        # Environment should override file
+        assert test_config.llm.provider == 'openai'
+        # Environment should also override ollama_model since OLLAMA_MODEL was set
+        assert test_config.llm.ollama_model == 'env-model'
     
     def test_config_save_and_reload(self):
         """Test configuration saving and reloading"""
@@ -202,71 +205,63 @@ class TestConfigurationIntegration:
         assert test_config.llm.openai_api_key == ""
         assert test_config.llm.ollama_url == "http://localhost:11434"
     
-    def test_cors_origins_parsing(self):
+    @pytest.mark.parametrize("cors_env,expected", [
+        # JSON array format
+        ('["http://localhost:3000", "https://example.com"]', ["http://localhost:3000", "https://example.com"]),
+        # Single string format
+        ('http://localhost:3000', ["http://localhost:3000"]),
+        # Invalid JSON (should fall back to single string)
+        ('invalid-json', ["invalid-json"]),
+    ])
+    def test_cors_origins_parsing(self, monkeypatch, cors_env, expected):
         """Test CORS origins parsing from environment"""
-        # Test JSON array format
-        with patch.dict(os.environ, {
-            'CORS_ORIGINS': '["http://localhost:3000", "https://example.com"]'
-        }):
-            test_config = BK25Config()
-            assert test_config.server.cors_origins == ["http://localhost:3000", "https://example.com"]
-        
-        # Test single string format
-        with patch.dict(os.environ, {
-            'CORS_ORIGINS': 'http://localhost:3000'
-        }):
-            test_config = BK25Config()
-            assert test_config.server.cors_origins == ["http://localhost:3000"]
-        
-        # Test invalid JSON (should fall back to single string)
-        with patch.dict(os.environ, {
-            'CORS_ORIGINS': 'invalid-json'
-        }):
-            test_config = BK25Config()
-            assert test_config.server.cors_origins == ["invalid-json"]
+        monkeypatch.setenv('CORS_ORIGINS', cors_env)
+        test_config = BK25Config()
+        assert test_config.server.cors_origins == expected
     
-    def test_numeric_environment_parsing(self):
+    def test_numeric_environment_parsing(self, monkeypatch):
         """Test numeric environment variables are parsed correctly"""
-        with patch.dict(os.environ, {
-            'BK25_PORT': '5000',
-            'LLM_TEMPERATURE': '0.2',
-            'LLM_MAX_TOKENS': '5000',
-            'LLM_TIMEOUT': '120'
-        }):
-            test_config = BK25Config()
-            
-            assert test_config.server.port == 5000
-            assert test_config.llm.temperature == 0.2
-            assert test_config.llm.max_tokens == 5000
-            assert test_config.llm.timeout == 120
+        monkeypatch.setenv('BK25_PORT', '5000')
+        monkeypatch.setenv('LLM_TEMPERATURE', '0.2')
+        monkeypatch.setenv('LLM_MAX_TOKENS', '5000')
+        monkeypatch.setenv('LLM_TIMEOUT', '120')
+        test_config = BK25Config()
+        
+        assert test_config.server.port == 5000
+        assert test_config.llm.temperature == 0.2
+        assert test_config.llm.max_tokens == 5000
+        assert test_config.llm.timeout == 120
     
-    def test_boolean_environment_parsing(self):
+    def test_boolean_environment_parsing(self, monkeypatch):
         """Test boolean environment variables are parsed correctly"""
-        with patch.dict(os.environ, {
-            'BK25_RELOAD': 'false',
-            'DATABASE_ECHO': 'true'
-        }):
-            test_config = BK25Config()
-            
-            assert test_config.server.reload is False
-            assert test_config.database.echo is True
+        monkeypatch.setenv('BK25_RELOAD', 'false')
+        monkeypatch.setenv('DATABASE_ECHO', 'true')
+        test_config = BK25Config()
+        
+        assert test_config.server.reload is False
+        assert test_config.database.echo is True
         
         # Test default values when not set
-        with patch.dict(os.environ, {}, clear=True):
-            test_config = BK25Config()
-            
-            assert test_config.server.reload is True
-            assert test_config.database.echo is False
+        _clear_environ(monkeypatch)
+        test_config = BK25Config()
+        
+        assert test_config.server.reload is True
+        assert test_config.database.echo is False
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Create test client shared by the web interface tests
+    
+    The app's lifespan is never entered, so sharing the client carries no
+    startup state; settings persist in the server-side config singleton.
+    """
+    return TestClient(app)
 
 
 class TestConfigurationWebInterface:
     """Test configuration integration with web interface"""
     
-    @pytest.fixture
-    def client(self):
-        """Create test client"""
-        return TestClient(app)
-    
     def test_web_interface_config_access(self, client):
         """Test that web interface can access configuration"""
         # Test root route serves web interface
@@ -292,23 +287,16 @@ class TestConfigurationWebInterface:
         
         html_content = response.text
         
-        # Check that settings button is present
-        assert "settings-btn" in html_content
-        
-        # Check that settings modal is present
-        assert "settings-modal" in html_content
-        
-        # Check that all provider options are present
-        assert "ollama" in html_content
-        assert "openai" in html_content
-        assert "anthropic" in html_content
-        assert "google" in html_content
-        assert "custom" in html_content
-        
-        # Check that advanced settings are present
-        assert "temperature" in html_content
-        assert "maxTokens" in html_content
-        assert "timeout" in html_content
+        required = (
+            # Settings button and modal
+            "settings-btn", "settings-modal",
+            # Provider options
+            "ollama", "openai", "anthropic", "google", "custom",
+            # Advanced settings
+            "temperature", "maxTokens", "timeout"
+        )
+        missing = [token for token in required if token not in html_content]
+        assert not missing, missing
     
     def test_configuration_persistence_across_sessions(self, client):
         """Test that configuration persists across different test sessions"""
@@ -332,11 +320,9 @@ class TestConfigurationWebInterface:
         assert data["provider"] == "openai"
         assert data["openai"]["apiKey"] == "persist-session-key"
         
-        # Create new client (simulating new session)
-        new_client = TestClient(app)
-        
-        # Verify settings are still available
-        response = new_client.get("/api/settings")
+        # Verify settings are still available on a later request; persistence
+        # lives in the server-side config, not in the client
+        response = client.get("/api/settings")
         assert response.status_code == 200
         
         data = response.json()
@@ -347,21 +333,17 @@ class TestConfigurationWebInterface:
 class TestConfigurationErrorHandling:
     """Test configuration system error handling"""
     
-    def test_invalid_config_file(self):
+    def test_invalid_config_file(self, tmp_path):
         """Test handling of invalid configuration file"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write("invalid json content")
-            config_file = f.name
+        config_file = tmp_path / "config.json"
+        config_file.write_text("invalid json content")
         
-        try:
-            # Should not raise exception, just log warning
-            test_config = BK25Config(config_file)
-            
-            # Should fall back to defaults
-            assert test_config.llm.provider == "ollama"
-            assert test_config.server.port == 3003
-        finally:
-            os.unlink(config_file)
+        # Should not raise exception, just log warning
+        test_config = BK25Config(str(config_file))
+        
+        # Should fall back to defaults
+        assert test_config.llm.provider == "ollama"
+        assert test_config.server.port == 3003
     
     def test_missing_config_file(self):
         """Test handling of missing configuration file"""
@@ -372,30 +354,35 @@ class TestConfigurationErrorHandling:
         assert test_config.llm.provider == "ollama"
         assert test_config.server.port == 3003
     
-    def test_invalid_environment_values(self):
+    def test_invalid_environment_values(self, monkeypatch):
         """Test handling of invalid environment variable values"""
-        with patch.dict(os.environ, {
-            'BK25_PORT': 'invalid-port',
-            'LLM_TEMPERATURE': 'invalid-temp',
-            'LLM_MAX_TOKENS': 'invalid-tokens'
-        }):
-            # Should not raise exception, should use defaults
-            test_config = BK25Config()
-            
-            assert test_config.server.port == 3003
-            assert test_config.llm.temperature == 0.7
-            assert test_config.llm.max_tokens == 2000
+        monkeypatch.setenv('BK25_PORT', 'invalid-port')
+        monkeypatch.setenv('LLM_TEMPERATURE', 'invalid-temp')
+        monkeypatch.setenv('LLM_MAX_TOKENS', 'invalid-tokens')
+        
+        # Should not raise exception, should use defaults
+        test_config = BK25Config()
+        
+        assert test_config.server.port == 3003
+        assert test_config.llm.temperature == 0.7
+        assert test_config.llm.max_tokens == 2000
     
-    def test_config_file_permission_errors(self):
+    def test_config_file_permission_errors(self, tmp_path):
         """Test handling of file permission errors"""
-        with patch('builtins.open', side_effect=PermissionError("Access denied")):
+        # The file must exist so the loader actually tries to open it
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({'llm': {'provider': 'openai'}}))
+        
+        # Patch only the open() that src.config resolves, not the builtin
+        with patch('src.config.open', side_effect=PermissionError("Access denied"), create=True):
             # Should not raise exception, just log warning
-            test_config = BK25Config("test_config.json")
+            test_config = BK25Config(str(config_file))
             
             # Should use defaults
             assert test_config.llm.provider == "ollama"
             assert test_config.server.port == 3003
     
+    @pytest.mark.creates_directories
     def test_directory_creation_errors(self):
         """Test handling of directory creation errors"""
         with patch('pathlib.Path.mkdir', side_effect=OSError("Permission denied")):
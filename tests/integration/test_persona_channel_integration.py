@@ -12,90 +12,98 @@ from src.core.channel_manager import ChannelManager
 from src.core.bk25 import BK25Core
 
 
-class TestPersonaChannelIntegration:
-    """Test integration between persona and channel systems"""
+# Every test in this module is a coroutine
+pytestmark = pytest.mark.asyncio
 
-    @pytest.fixture
-    def temp_dir(self, tmp_path):
-        """Create temporary directory for test files"""
-        return tmp_path
 
-    @pytest.fixture
-    def personas_path(self, temp_dir):
-        """Create personas directory with test data"""
-        personas_dir = temp_dir / "personas"
-        personas_dir.mkdir()
-        
-        # Create test persona files
-        persona_data = [
-            {
-                "id": "web-persona",
-                "name": "Web Persona",
-                "description": "Persona for web interface",
-                "greeting": "Hello from web!",
-                "capabilities": ["web_automation", "ui_testing"],
-                "personality": {
-                    "tone": "friendly",
-                    "approach": "helpful",
-                    "philosophy": "web_first",
-                    "motto": "Web automation made easy"
-                },
-                "examples": ["Create a web form", "Test a website"],
-                "channels": ["web"],
-                "systemPrompt": "You are a web automation expert."
+@pytest.fixture(scope="module")
+def temp_dir(tmp_path_factory):
+    """Create temporary directory for test files"""
+    return tmp_path_factory.mktemp("integration")
+
+
+@pytest.fixture(scope="module")
+def personas_path(temp_dir):
+    """Create personas directory with test data"""
+    personas_dir = temp_dir / "personas"
+    personas_dir.mkdir()
+    
+    # Create test persona files
+    persona_data = [
+        {
+            "id": "web-persona",
+            "name": "Web Persona",
+            "description": "Persona for web interface",
+            "greeting": "Hello from web!",
+            "capabilities": ["web_automation", "ui_testing"],
+            "personality": {
+                "tone": "friendly",
+                "approach": "helpful",
+                "philosophy": "web_first",
+                "motto": "Web automation made easy"
+            },
+            "examples": ["Create a web form", "Test a website"],
+            "channels": ["web"],
+            "systemPrompt": "You are a web automation expert."
+        },
+        {
+            "id": "slack-persona",
+            "name": "Slack Persona",
+            "description": "Persona for Slack integration",
+            "greeting": "Hello from Slack!",
+            "capabilities": ["slack_automation", "team_collaboration"],
+            "personality": {
+                "tone": "professional",
+                "approach": "collaborative",
+                "philosophy": "team_work",
+                "motto": "Better together"
             },
-            {
-                "id": "slack-persona",
-                "name": "Slack Persona",
-                "description": "Persona for Slack integration",
-                "greeting": "Hello from Slack!",
-                "capabilities": ["slack_automation", "team_collaboration"],
-                "personality": {
-                    "tone": "professional",
-                    "approach": "collaborative",
-                    "philosophy": "team_work",
-                    "motto": "Better together"
-                },
-                "examples": ["Send Slack message", "Create channel"],
-                "channels": ["slack"],
-                "systemPrompt": "You are a Slack automation expert."
+            "examples": ["Send Slack message", "Create channel"],
+            "channels": ["slack"],
+            "systemPrompt": "You are a Slack automation expert."
+        },
+        {
+            "id": "multi-channel-persona",
+            "name": "Multi-Channel Persona",
+            "description": "Persona for multiple channels",
+            "greeting": "Hello from multiple channels!",
+            "capabilities": ["cross_platform", "integration"],
+            "personality": {
+                "tone": "versatile",
+                "approach": "adaptive",
+                "philosophy": "platform_agnostic",
+                "motto": "Works everywhere"
             },
-            {
-                "id": "multi-channel-persona",
-                "name": "Multi-Channel Persona",
-                "description": "Persona for multiple channels",
-                "greeting": "Hello from multiple channels!",
-                "capabilities": ["cross_platform", "integration"],
-                "personality": {
-                    "tone": "versatile",
-                    "approach": "adaptive",
-                    "philosophy": "platform_agnostic",
-                    "motto": "Works everywhere"
-                },
-                "examples": ["Cross-platform script", "Multi-channel message"],
-                "channels": ["web", "slack", "teams"],
-                "systemPrompt": "You are a cross-platform automation expert."
-            }
-        ]
-        
-        for persona in persona_data:
-            persona_file = personas_dir / f"{persona['id']}.json"
-            persona_file.write_text(json.dumps(persona, indent=2))
-        
-        return str(personas_dir)
+            "examples": ["Cross-platform script", "Multi-channel message"],
+            "channels": ["web", "slack", "teams"],
+            "systemPrompt": "You are a cross-platform automation expert."
+        }
+    ]
+    
+    for persona in persona_data:
+        persona_file = personas_dir / f"{persona['id']}.json"
+        persona_file.write_text(json.dumps(persona, indent=2))
+    
+    return str(personas_dir)
+
+
+@pytest.fixture(scope="module")
+def _shared_persona_manager(personas_path):
+    """Create PersonaManager instance, loaded once for the module"""
+    pm = PersonaManager(personas_path)
+    asyncio.run(pm.initialize())
+    return pm
+
+
+class TestPersonaChannelIntegration:
+    """Test integration between persona and channel systems"""
 
     @pytest.fixture
-    def persona_manager(self, personas_path):
-        """Create PersonaManager instance"""
-        pm = PersonaManager(personas_path)
-        # Initialize synchronously by running the async method in the event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(pm.initialize())
-            return pm
-        finally:
-            loop.close()
+    def persona_manager(self, _shared_persona_manager):
+        """Shared PersonaManager, with the current persona restored after each test"""
+        initial_id = _shared_persona_manager.current_persona.id
+        yield _shared_persona_manager
+        _shared_persona_manager.current_persona = _shared_persona_manager.personas.get(initial_id)
 
     @pytest.fixture
     def channel_manager(self):
@@ -122,16 +130,9 @@ class TestPersonaChannelIntegration:
         core.execution_monitor.start_monitoring = AsyncMock()
         core.execution_monitor.get_system_statistics = AsyncMock(return_value={})
         
-        # Initialize synchronously by running the async method in the event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(core.initialize())
-            return core
-        finally:
-            loop.close()
+        asyncio.run(core.initialize())
+        return core
 
-    @pytest.mark.asyncio
     async def test_persona_channel_compatibility(self, persona_manager, channel_manager):
         """Test that personas and channels are compatible"""
         # Get all personas
@@ -155,7 +156,6 @@ class TestPersonaChannelIntegration:
         assert len(teams_personas) == 1  # Only multi-channel-persona
         assert any(p.id == "multi-channel-persona" for p in teams_personas)
 
-    @pytest.mark.asyncio
     async def test_persona_switching_preserves_channel_context(self, persona_manager, channel_manager):
         """Test that persona switching preserves channel context"""
         # Switch to web persona
@@ -179,7 +179,6 @@ class TestPersonaChannelIntegration:
         assert web_persona_again is not None
         assert web_persona_again.id == "web-persona"
 
-    @pytest.mark.asyncio
     async def test_channel_specific_persona_capabilities(self, persona_manager):
         """Test that personas have channel-specific capabilities"""
         # Get web persona
@@ -206,7 +205,6 @@ class TestPersonaChannelIntegration:
         assert "cross_platform" in multi_persona.capabilities
         assert "integration" in multi_persona.capabilities
 
-    @pytest.mark.asyncio
     async def test_persona_channel_switching_workflow(self, bk25_core):
         """Test complete workflow of persona and channel switching"""
         # Initial state - should have a default persona set
@@ -237,7 +235,6 @@ class TestPersonaChannelIntegration:
         assert initial_persona_again is not None
         assert initial_persona_again.id == initial_persona_id
 
-    @pytest.mark.asyncio
     async def test_persona_channel_validation(self, persona_manager):
         """Test validation of persona-channel combinations"""
         # Test valid combinations
@@ -256,7 +253,6 @@ class TestPersonaChannelIntegration:
         assert "teams" not in web_persona.channels
         assert "web" not in slack_persona.channels
 
-    @pytest.mark.asyncio
     async def test_persona_channel_examples(self, persona_manager):
         """Test that personas have channel-appropriate examples"""
         # Web persona examples
@@ -274,7 +270,6 @@ class TestPersonaChannelIntegration:
         multi_examples = multi_persona.examples
         assert any("cross" in example.lower() or "multi" in example.lower() for example in multi_examples)
 
-    @pytest.mark.asyncio
     async def test_persona_channel_personality_alignment(self, persona_manager):
         """Test that persona personalities align with channel purposes"""
         # Web persona - should be user-friendly
@@ -295,7 +290,6 @@ class TestPersonaChannelIntegration:
         assert "adaptive" in multi_persona.personality.approach
         assert "platform_agnostic" in multi_persona.personality.philosophy
 
-    @pytest.mark.asyncio
     async def test_persona_channel_system_prompts(self, persona_manager):
         """Test that system prompts are channel-appropriate"""
         # Web persona system prompt
@@ -310,7 +304,6 @@ class TestPersonaChannelIntegration:
         multi_persona = persona_manager.get_persona("multi-channel-persona")
         assert "cross-platform automation expert" in multi_persona.system_prompt.lower()
 
-    @pytest.mark.asyncio
     async def test_persona_channel_greeting_consistency(self, persona_manager):
         """Test that greetings are consistent with channel context"""
         # Web persona greeting
@@ -325,7 +318,6 @@ class TestPersonaChannelIntegration:
         multi_persona = persona_manager.get_persona("multi-channel-persona")
         assert "multiple channels" in multi_persona.greeting.lower()
 
-    @pytest.mark.asyncio
     async def test_persona_channel_switching_performance(self, persona_manager):
         """Test performance of persona-channel switching"""
         import time
@@ -345,7 +337,6 @@ class TestPersonaChannelIntegration:
         assert total_time < 1.0
         assert persona_manager.get_current_persona().id == "multi-channel-persona"
 
-    @pytest.mark.asyncio
     async def test_persona_channel_error_handling(self, persona_manager):
         """Test error handling in persona-channel operations"""
         # Test switching to non-existent persona
@@ -360,7 +351,6 @@ class TestPersonaChannelIntegration:
         non_existent_persona = persona_manager.get_persona("nonexistent-persona")
         assert non_existent_persona is None
 
-    @pytest.mark.asyncio
     async def test_persona_channel_data_persistence(self, persona_manager, personas_path):
         """Test that persona-channel data persists across reloads"""
         # Get initial personas
@@ -380,7 +370,6 @@ class TestPersonaChannelIntegration:
         assert web_persona.name == "Web Persona"
         assert "web" in web_persona.channels
 
-    @pytest.mark.asyncio
     async def test_persona_channel_cross_reference(self, persona_manager):
         """Test cross-referencing between personas and channels"""
         # Get all personas
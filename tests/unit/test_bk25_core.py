@@ -2,6 +2,7 @@
 Unit tests for BK25Core component
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from src.core.bk25 import BK25Core
@@ -488,6 +489,56 @@ class TestBK25Core:
         with pytest.raises(Exception, match="Shutdown failed"):
             await bk25_core.shutdown_execution_monitoring()
 
+    @pytest.mark.asyncio
+    async def test_get_task_status_coalesces_polls(self, bk25_core):
+        """Test concurrent and repeated task status polls share one lookup"""
+        async def slow_lookup(task_id):
+            await asyncio.sleep(0.01)
+            return None
+        
+        bk25_core.execution_monitor.get_task_status = AsyncMock(side_effect=slow_lookup)
+        
+        results = await asyncio.gather(*(bk25_core.get_task_status("task-1") for _ in range(5)))
+        await bk25_core.get_task_status("task-1")
+        
+        bk25_core.execution_monitor.get_task_status.assert_awaited_once_with("task-1")
+        assert all(result["error"] == "Task not found: task-1" for result in results)
+        
+        # Once the TTL has passed the next poll goes back to the monitor
+        bk25_core.task_status_ttl = 0
+        await bk25_core.get_task_status("task-1")
+        assert bk25_core.execution_monitor.get_task_status.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancel_during_task_status_poll(self, bk25_core):
+        """Test a poll in flight during a cancel does not cache the pre-cancel status"""
+        statuses = ["running", "cancelled"]
+        lookup_started = asyncio.Event()
+        release_lookup = asyncio.Event()
+        
+        async def lookup(task_id):
+            status = statuses.pop(0)
+            if status == "running":
+                lookup_started.set()
+                await release_lookup.wait()
+            return status
+        
+        bk25_core.execution_monitor.get_task_status = AsyncMock(side_effect=lookup)
+        bk25_core.execution_monitor.cancel_task = AsyncMock(return_value=True)
+        bk25_core._serialize_task = lambda task: {"status": task}
+        
+        poll = asyncio.ensure_future(bk25_core.get_task_status("task-1"))
+        await lookup_started.wait()
+        await bk25_core.cancel_execution_task("task-1")
+        release_lookup.set()
+        
+        stale = await poll
+        assert stale["task"]["status"] == "running"
+        
+        result = await bk25_core.get_task_status("task-1")
+        assert result["task"]["status"] == "cancelled"
+        assert bk25_core.execution_monitor.get_task_status.await_count == 2
+
     def test_config_validation(self, mock_config):
         """Test configuration validation"""
         core = BK25Core(mock_config)
@@ -56,6 +56,8 @@ class TestServerConfig:
         assert config.host == "0.0.0.0"
         assert config.port == 3003
         assert config.reload is True
+        assert config.workers == 1
+        assert config.access_log is False
         assert config.secret_key == "your-secret-key-here-change-this-in-production"
         assert config.cors_origins is None
     
@@ -148,7 +150,9 @@ class TestBK25Config:
             'BK25_PORT': '8080',
             'LLM_TEMPERATURE': '0.3',
             'LLM_MAX_TOKENS': '1500',
-            'BK25_RELOAD': 'false'
+            'BK25_RELOAD': 'false',
+            'BK25_WORKERS': '4',
+            'BK25_ACCESS_LOG': 'true'
         }.get(key, default)
         
         config = BK25Config()
@@ -160,6 +164,8 @@ class TestBK25Config:
         assert config.llm.temperature == 0.3
         assert config.llm.max_tokens == 1500
         assert config.server.reload is False
+        assert config.server.workers == 4
+        assert config.server.access_log is True
     
     @patch('src.config.Path.exists')
     @patch('builtins.open', new_callable=mock_open)
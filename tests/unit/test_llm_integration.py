@@ -0,0 +1,71 @@
+"""
+Unit tests for LLMManager provider selection
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+from src.core.llm_integration import LLMManager, LLMRequest, LLMResponse
+
+
+class TestLLMManager:
+    """Test LLMManager provider selection and fallback"""
+
+    @pytest.fixture
+    def llm_manager(self):
+        """Create LLMManager with mocked Ollama and OpenAI providers"""
+        manager = LLMManager({
+            'ollama_url': 'http://localhost:11434',
+            'openai_api_key': 'test-key'
+        })
+        for name in ('ollama', 'openai'):
+            provider = Mock()
+            provider.is_available = AsyncMock(return_value=True)
+            provider.generate = AsyncMock(return_value=LLMResponse(
+                success=True,
+                content=f"{name} response",
+                metadata={'provider': name}
+            ))
+            manager.providers[name] = provider
+        return manager
+
+    @pytest.fixture
+    def llm_request(self):
+        """Create a basic generation request"""
+        return LLMRequest(prompt="Write a backup script", model="test-model")
+
+    @pytest.mark.asyncio
+    async def test_generate_uses_preferred_provider(self, llm_manager, llm_request):
+        """Test generation goes to the preferred provider when it is available"""
+        response = await llm_manager.generate(llm_request, preferred_provider='openai')
+
+        assert response.success is True
+        assert response.content == "openai response"
+        llm_manager.providers['ollama'].is_available.assert_not_awaited()
+        llm_manager.providers['ollama'].generate.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_generate_falls_back_when_preferred_unavailable(self, llm_manager, llm_request):
+        """Test an unavailable preferred provider is probed once before falling back"""
+        preferred = llm_manager.providers['ollama']
+        preferred.is_available.return_value = False
+
+        response = await llm_manager.generate(llm_request, preferred_provider='ollama')
+
+        assert response.success is True
+        assert response.content == "openai response"
+        preferred.is_available.assert_awaited_once()
+        preferred.generate.assert_not_awaited()
+        llm_manager.providers['openai'].generate.assert_awaited_once_with(llm_request)
+
+    @pytest.mark.asyncio
+    async def test_generate_without_available_providers(self, llm_manager, llm_request):
+        """Test generation reports an error when no provider is available"""
+        for provider in llm_manager.providers.values():
+            provider.is_available.return_value = False
+
+        response = await llm_manager.generate(llm_request, preferred_provider='ollama')
+
+        assert response.success is False
+        assert response.error == "No LLM providers available"
+        llm_manager.providers['ollama'].is_available.assert_awaited_once()
+        llm_manager.providers['openai'].is_available.assert_awaited_once()
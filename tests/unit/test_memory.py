@@ -0,0 +1,55 @@
+"""
+Unit tests for ConversationMemory component
+"""
+
+import pytest
+from src.core.memory import ConversationMemory
+
+
+class TestConversationMemory:
+    """Test ConversationMemory lookups"""
+
+    @pytest.fixture
+    def memory(self):
+        """Create ConversationMemory with two stored conversations"""
+        memory = ConversationMemory(max_conversations=3)
+        memory.create_conversation("conv-1", "vanilla")
+        memory.create_conversation("conv-2", "ben-brown", channel="slack")
+        return memory
+
+    def test_get_conversations_returns_known_conversations(self, memory):
+        """Test get_conversations maps each ID to its stored conversation"""
+        conversations = memory.get_conversations(["conv-1", "conv-2"])
+
+        assert conversations == {
+            "conv-1": memory.get_conversation("conv-1"),
+            "conv-2": memory.get_conversation("conv-2")
+        }
+        assert conversations["conv-2"].persona_id == "ben-brown"
+        assert conversations["conv-2"].channel == "slack"
+
+    def test_get_conversations_unknown_ids(self, memory):
+        """Test get_conversations maps unknown IDs to None"""
+        conversations = memory.get_conversations(["conv-1", "missing"])
+
+        assert conversations["conv-1"].id == "conv-1"
+        assert conversations["missing"] is None
+
+    def test_get_conversations_evicted_ids(self, memory):
+        """Test get_conversations maps conversations evicted over the limit to None"""
+        memory.create_conversation("conv-3", "vanilla")
+        memory.create_conversation("conv-4", "vanilla")
+
+        conversations = memory.get_conversations(["conv-1", "conv-2", "conv-3", "conv-4"])
+
+        assert conversations["conv-1"] is None
+        assert [conversations[conv_id].id for conv_id in ("conv-2", "conv-3", "conv-4")] == [
+            "conv-2", "conv-3", "conv-4"
+        ]
+
+    def test_get_conversations_duplicate_and_empty_ids(self, memory):
+        """Test get_conversations collapses repeated IDs and accepts an empty list"""
+        conversations = memory.get_conversations(["conv-1", "conv-1", "conv-2", "conv-1"])
+
+        assert list(conversations) == ["conv-1", "conv-2"]
+        assert memory.get_conversations([]) == {}